@@ -1,43 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Callable, List, Dict, Tuple, Optional
+import asyncio
 import os
 import time
-from ..database import get_db
+from ..database import get_db, SessionLocal
 from ..models.user import User
 from ..models.cv import CV
-from ..schemas.cv import CVResponse, CVUploadResponse, CVExtractedData, CVUpdateData
+from ..schemas.cv import CVResponse, CVUploadResponse, CVExtractedData, CVUpdateData, CVJobResponse
 from ..core.deps import get_current_user
+from ..core.uploads import save_upload_file
 from ..config import settings
-from ..services.cv_extractor_v3 import CVExtractorV3
+from ..services.extraction_pool import (
+    ExtractionPool, ExtractionPoolSaturated, ExtractionPoolUnavailable, ExtractionTimeout,
+    get_extraction_pool
+)
+from ..services.job_store import JobStore, get_job_store
+from ..services.extraction_cache import ExtractionCache, get_extraction_cache
+from ..services.extraction_budget import TRUNCATED_DEADLINE
 
 router = APIRouter(prefix="/api/cvs", tags=["CVs"])
 
 ALLOWED_CV_TYPES = {"application/pdf", "image/jpeg", "image/jpg", "image/png"}
 
+# Extraction metadata added by the extractor (not CV data)
+EXTRACTION_METADATA_KEYS = (
+    "dataset_version", "fuzzy_backend", "skills_generation", "timings", "truncated",
+    "truncated_reasons"
+)
 
-@router.post("/upload", response_model=CVUploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_cv(
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Upload a CV file and extract data for verification"""
-    # Validate file type
-    if file.content_type not in ALLOWED_CV_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF and image files are allowed"
-        )
-    
-    # Read file and validate size
-    contents = await file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size must be less than {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-        )
-    
+
+def _extraction_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="CV extraction is busy, please retry shortly",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def _save_cv_file(file: UploadFile, user_id: int) -> Tuple[str, str, str, str]:
+    """Validate and store an uploaded CV, return (filename, file_path, type_fichier, sha256)"""
     # Determine file type
     extension = file.filename.split(".")[-1].lower()
     if extension == "pdf":
@@ -50,19 +53,68 @@ async def upload_cv(
         type_fichier = extension
     
     # Generate unique filename
-    filename = f"{current_user.id}_{int(time.time())}.{extension}"
+    filename = f"{user_id}_{int(time.time())}.{extension}"
     file_path = os.path.join(settings.CV_DIR, filename)
     
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Stream file to disk, enforcing the size limit and hashing on the way
+    file_hash = await save_upload_file(
+        file,
+        file_path,
+        max_size=settings.MAX_UPLOAD_SIZE,
+        too_large_detail=f"File size must be less than {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+    )
+    
+    return filename, file_path, type_fichier, file_hash
+
+
+async def _cache_lookup(cache: ExtractionCache, file_hash: str) -> Optional[Dict]:
+    """Cached result for the dataset on disk (file I/O kept off the event loop)"""
+    return await run_in_threadpool(lambda: cache.get(cache.make_key(file_hash)))
+
+
+async def _extract_cached(
+    pool: ExtractionPool,
+    cache: Optional[ExtractionCache],
+    file_path: str,
+    file_hash: str,
+    on_start: Optional[Callable[[], None]] = None
+) -> Dict:
+    """Extract a CV, reusing the cached result of an identical upload"""
+    if cache is not None:
+        cached = await _cache_lookup(cache, file_hash)
+        if cached is not None:
+            return cached
+    
+    extracted_raw = await pool.extract(file_path, on_start=on_start)
     
-    # Extract data from CV using V3 extractor (Kaggle + ESCO + Advanced)
-    extractor = CVExtractorV3()
-    extracted_raw = extractor.extract_from_file(file_path)
+    # Key on the dataset version and fuzzy backend the extractor actually used; skip empty
+    # results (OCR/PDF failure) so a retry gets a fresh extraction, and
+    # results cut by the deadline, which depends on the load at the time
+    cacheable = (
+        TRUNCATED_DEADLINE not in extracted_raw.get("truncated_reasons", ())
+        and any(v for k, v in extracted_raw.items() if k not in EXTRACTION_METADATA_KEYS)
+    )
+    if cache is not None and cacheable:
+        # Stage timings describe this run only: not cached
+        cached = {k: v for k, v in extracted_raw.items() if k != "timings"}
+        key = cache.make_key(
+            file_hash, extracted_raw.get("dataset_version"), extracted_raw.get("fuzzy_backend")
+        )
+        await run_in_threadpool(cache.set, key, cached)
     
-    # Map to expected format for database and response
-    extracted_data = {
+    return extracted_raw
+
+
+def _debug_timings(extracted_raw: Dict) -> Optional[Dict[str, float]]:
+    """Stage timings of a fresh extraction, exposed only in debug mode"""
+    if not settings.EXTRACTION_DEBUG_TIMINGS:
+        return None
+    return extracted_raw.get("timings")
+
+
+def _map_extracted_data(extracted_raw: Dict) -> Dict:
+    """Map extractor output to the format expected by the database and response"""
+    return {
         "nom_complet": extracted_raw.get("nom", ""),
         "email": extracted_raw.get("email", ""),
         "telephone": extracted_raw.get("telephone", ""),
@@ -71,13 +123,17 @@ async def upload_cv(
         "experience": extracted_raw.get("experience", []),
         "formation": extracted_raw.get("formation", []),
         "langues": extracted_raw.get("langues", []),
+        "truncated": extracted_raw.get("truncated", False),
         "contenu_texte": ""  # Will be populated if needed
     }
-    
-    # Create CV entry in database with temporary data
+
+
+def _create_cv(db: Session, user_id: int, nom_fichier: str, type_fichier: str,
+               filename: str, extracted_data: Dict) -> CV:
+    """Create CV entry in database with temporary data"""
     new_cv = CV(
-        user_id=current_user.id,
-        nom_fichier=file.filename,
+        user_id=user_id,
+        nom_fichier=nom_fichier,
         type_fichier=type_fichier,
         chemin_fichier=filename,
         contenu_texte=extracted_data.get("contenu_texte", ""),
@@ -87,14 +143,194 @@ async def upload_cv(
     db.add(new_cv)
     db.commit()
     db.refresh(new_cv)
+    return new_cv
+
+
+@router.post("/upload", response_model=CVUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_cv(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    pool: ExtractionPool = Depends(get_extraction_pool),
+    cache: Optional[ExtractionCache] = Depends(get_extraction_cache)
+):
+    """Upload a CV file and extract data for verification"""
+    # Validate file type
+    if file.content_type not in ALLOWED_CV_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF and image files are allowed"
+        )
+    
+    # Reject early when the extraction queue is full (backpressure); with a
+    # cache, a busy pool is only a 503 once the upload is known to be a miss
+    if pool.saturated and cache is None:
+        raise _extraction_busy_exception()
+    
+    filename, file_path, type_fichier, file_hash = await _save_cv_file(file, current_user.id)
+    
+    # Extract data from CV in the extraction pool (off the event loop)
+    try:
+        extracted_raw = await _extract_cached(pool, cache, file_path, file_hash)
+    except (ExtractionPoolSaturated, ExtractionPoolUnavailable):
+        os.remove(file_path)
+        raise _extraction_busy_exception()
+    except ExtractionTimeout:
+        os.remove(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="CV extraction took too long"
+        )
+    
+    extracted_data = _map_extracted_data(extracted_raw)
+    new_cv = await run_in_threadpool(
+        _create_cv, db, current_user.id, file.filename, type_fichier, filename, extracted_data
+    )
     
     # Return CV with extracted data for verification
     return {
         "id": new_cv.id,
-        "extracted_data": CVExtractedData(**extracted_data)
+        "extracted_data": CVExtractedData(**extracted_data),
+        "timings": _debug_timings(extracted_raw),
+    }
+
+
+async def _run_ingestion_job(
+    job_id: str,
+    user_id: int,
+    nom_fichier: str,
+    type_fichier: str,
+    filename: str,
+    file_path: str,
+    file_hash: str,
+    pool: ExtractionPool,
+    cache: Optional[ExtractionCache],
+    store: JobStore
+):
+    """Background extraction for an async upload, result stored on the job"""
+    # Job store and database writes are blocking (DatabaseJobStore commits):
+    # they all run in the threadpool, never on the event loop
+    started = []
+    
+    # The job stays "queued" while it waits for a free extraction process.
+    # Called on the loop when a worker picks the job up: only schedules the write
+    def mark_running():
+        started.append(asyncio.ensure_future(
+            run_in_threadpool(store.update, job_id, status="running")
+        ))
+    
+    async def finish(**fields):
+        # The "running" write must land before the final status
+        await asyncio.gather(*started, return_exceptions=True)
+        await run_in_threadpool(store.update, job_id, **fields)
+    
+    try:
+        extracted_raw = await _extract_cached(pool, cache, file_path, file_hash, on_start=mark_running)
+    except (ExtractionPoolSaturated, ExtractionPoolUnavailable, ExtractionTimeout) as e:
+        os.remove(file_path)
+        await finish(status="failed", error=str(e))
+        return
+    except Exception as e:
+        os.remove(file_path)
+        await finish(status="failed", error=f"Extraction failed: {e}")
+        return
+    
+    extracted_data = _map_extracted_data(extracted_raw)
+    
+    try:
+        new_cv = await run_in_threadpool(
+            _create_job_cv, user_id, nom_fichier, type_fichier, filename, extracted_data
+        )
+    except Exception as e:
+        os.remove(file_path)
+        await finish(status="failed", error=f"Could not save CV: {e}")
+        return
+    
+    timings = _debug_timings(extracted_raw)
+    result = {**extracted_data, "timings": timings} if timings else extracted_data
+    await finish(status="done", cv_id=new_cv.id, result=result)
+
+
+def _create_job_cv(user_id: int, nom_fichier: str, type_fichier: str,
+                   filename: str, extracted_data: Dict) -> CV:
+    """_create_cv for a background job: the request session is closed by now"""
+    db = SessionLocal()
+    try:
+        return _create_cv(db, user_id, nom_fichier, type_fichier, filename, extracted_data)
+    finally:
+        db.close()
+
+
+def _job_response(job: Dict) -> Dict:
+    result = job.get("result")
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "cv_id": job.get("cv_id"),
+        "extracted_data": CVExtractedData(**result) if result else None,
+        "timings": result.get("timings") if result else None,
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
     }
 
 
+@router.post("/upload/async", response_model=CVJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_cv_async(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    pool: ExtractionPool = Depends(get_extraction_pool),
+    cache: Optional[ExtractionCache] = Depends(get_extraction_cache),
+    store: JobStore = Depends(get_job_store)
+):
+    """Upload a CV file and extract it in the background (poll GET /jobs/{id})"""
+    # Validate file type
+    if file.content_type not in ALLOWED_CV_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF and image files are allowed"
+        )
+    
+    # Reject early when the extraction queue is full (backpressure); with a
+    # cache, a busy pool is only a 503 once the upload is known to be a miss
+    if pool.saturated and cache is None:
+        raise _extraction_busy_exception()
+    
+    filename, file_path, type_fichier, file_hash = await _save_cv_file(file, current_user.id)
+    
+    if pool.saturated and (cache is None or await _cache_lookup(cache, file_hash) is None):
+        os.remove(file_path)
+        raise _extraction_busy_exception()
+    
+    job = await run_in_threadpool(store.create, current_user.id, file.filename)
+    background_tasks.add_task(
+        _run_ingestion_job,
+        job["id"], current_user.id, file.filename, type_fichier, filename, file_path,
+        file_hash, pool, cache, store
+    )
+    
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=CVJobResponse)
+def get_cv_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    store: JobStore = Depends(get_job_store)
+):
+    """Get the status of an async CV ingestion job (with extracted data when done)"""
+    job = store.get(job_id)
+    
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return _job_response(job)
+
+
 @router.put("/{cv_id}/update-data", response_model=CVResponse)
 def update_cv_data(
     cv_id: int,
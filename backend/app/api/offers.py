@@ -1,66 +1,142 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import cast, func, tuple_
+from sqlalchemy.dialects.postgresql import REAL, REGCONFIG, TSQUERY
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Optional
+from datetime import date
+import base64
+import json
 from ..database import get_db
-from ..models.offer import ScrapedOffer
-from ..schemas.offer import OfferResponse
+from ..models.offer import ScrapedOffer, SEARCH_CONFIGS, OFFER_SORT_DATE, UNDATED_SORT_DATE
+from ..schemas.offer import OfferResponse, OfferPage
 from ..scrapers.rekrute_scraper import RekruteScraper
 from ..config import settings
 
 router = APIRouter(prefix="/api/offers", tags=["Offers"])
 
 
-@router.get("", response_model=List[OfferResponse])
+def _apply_filters(query, ville: Optional[str], type_contrat: Optional[str]):
+    """Substring filters on city and contract type (served by the pg_trgm GIN indexes)"""
+    if ville:
+        query = query.filter(ScrapedOffer.ville.ilike(f"%{ville}%"))
+    if type_contrat:
+        query = query.filter(ScrapedOffer.type_contrat.ilike(f"%{type_contrat}%"))
+    return query
+
+
+def _search_tsquery(q: str):
+    """Keywords parsed in each search language (web search syntax: "quotes", or, -word)"""
+    query = None
+    for config in SEARCH_CONFIGS:
+        parsed = func.websearch_to_tsquery(cast(config, REGCONFIG), q, type_=TSQUERY)
+        query = parsed if query is None else query.op("||")(parsed)
+    return query
+
+
+def _encode_cursor(position: Dict) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps(position, separators=(",", ":")).encode()
+    ).decode().rstrip("=")
+
+
+def _invalid_cursor_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def _decode_cursor(cursor: str, ranked: bool) -> list:
+    """Sort key values of the last offer of the previous page"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = [date.fromisoformat(position["d"]), int(position["i"])]
+        if ranked:
+            # Compared as real, like ts_rank, so that ties stay exact
+            values.insert(0, cast(float(position["r"]), REAL))
+    except (ValueError, KeyError, TypeError):
+        raise _invalid_cursor_exception()
+    return values
+
+
+def _paginate(query, limit: int, cursor: Optional[str], rank=None) -> Dict:
+    """
+    Keyset pagination on (publication date, id), after the relevance rank if any
+    
+    Each page starts right after the previous one's last offer, so deep
+    pages cost the same as the first one (no OFFSET). The listing order is
+    served by the ix_scraped_offers_listing index.
+    """
+    sort_keys = [OFFER_SORT_DATE, ScrapedOffer.id]
+    if rank is not None:
+        sort_keys.insert(0, rank)
+        query = query.add_columns(rank)
+    
+    if cursor:
+        query = query.filter(tuple_(*sort_keys) < tuple_(*_decode_cursor(cursor, rank is not None)))
+    
+    # One extra row tells whether there is a next page
+    rows = query.order_by(*(key.desc() for key in sort_keys)).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    offers = [row[0] for row in rows] if rank is not None else rows
+    
+    next_cursor = None
+    if has_more:
+        last = offers[-1]
+        position = {
+            "d": (last.date_publication or UNDATED_SORT_DATE).isoformat(),
+            "i": last.id,
+        }
+        if rank is not None:
+            position["r"] = rows[-1][1]
+        next_cursor = _encode_cursor(position)
+    
+    return {"items": offers, "next_cursor": next_cursor}
+
+
+@router.get("", response_model=OfferPage)
 def get_offers(
     ville: Optional[str] = None,
     type_contrat: Optional[str] = None,
     limit: int = Query(50, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get list of active job offers"""
+    """Get active job offers, newest first (pass next_cursor to get the next page)"""
     query = db.query(ScrapedOffer).filter(ScrapedOffer.est_active == True)
     
     # Apply filters
-    if ville:
-        query = query.filter(ScrapedOffer.ville.ilike(f"%{ville}%"))
-    if type_contrat:
-        query = query.filter(ScrapedOffer.type_contrat.ilike(f"%{type_contrat}%"))
+    query = _apply_filters(query, ville, type_contrat)
     
-    # Sort by date and limit
-    offers = query.order_by(ScrapedOffer.date_publication.desc()).limit(limit).all()
-    
-    return offers
+    return _paginate(query, limit, cursor)
 
 
-@router.get("/search", response_model=List[OfferResponse])
+@router.get("/search", response_model=OfferPage)
 def search_offers(
     q: Optional[str] = None,
     ville: Optional[str] = None,
     type_contrat: Optional[str] = None,
     limit: int = Query(50, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Search job offers by keywords"""
+    """Search job offers by keywords, most relevant first (pass next_cursor to get the next page)"""
     query = db.query(ScrapedOffer).filter(ScrapedOffer.est_active == True)
     
-    # Search in title and description
+    # Full-text search in title and description (GIN index on search_vector)
+    rank = None
     if q:
-        search_term = f"%{q}%"
-        query = query.filter(
-            (ScrapedOffer.titre.ilike(search_term)) | 
-            (ScrapedOffer.description.ilike(search_term))
-        )
+        ts_query = _search_tsquery(q)
+        query = query.filter(ScrapedOffer.search_vector.op("@@")(ts_query))
+        # Title matches weigh more than description matches; date breaks ties
+        rank = func.ts_rank(ScrapedOffer.search_vector, ts_query, type_=REAL)
     
     # Apply filters
-    if ville:
-        query = query.filter(ScrapedOffer.ville.ilike(f"%{ville}%"))
-    if type_contrat:
-        query = query.filter(ScrapedOffer.type_contrat.ilike(f"%{type_contrat}%"))
+    query = _apply_filters(query, ville, type_contrat)
     
-    # Sort by date and limit
-    offers = query.order_by(ScrapedOffer.date_publication.desc()).limit(limit).all()
-    
-    return offers
+    return _paginate(query, limit, cursor, rank)
 
 
 @router.get("/{offer_id}", response_model=OfferResponse)
@@ -78,8 +154,13 @@ def get_offer(offer_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/scrape")
-def scrape_offers(db: Session = Depends(get_db)):
-    """Manually trigger job scraping (admin only in production)"""
+async def scrape_offers(db: Session = Depends(get_db)):
+    """
+    Manually trigger job scraping (admin only in production)
+    
+    The crawl runs on the event loop (concurrent, non-blocking requests);
+    the database writes run in the threadpool.
+    """
     if not settings.SCRAPING_ENABLED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -88,13 +169,14 @@ def scrape_offers(db: Session = Depends(get_db)):
     
     try:
         scraper = RekruteScraper()
-        offers = scraper.scrape()
-        saved_count = scraper.save_to_db(offers, db)
+        offers = await scraper.scrape_async()
+        counts = await run_in_threadpool(scraper.save_to_db, offers, db)
         
         return {
             "status": "success",
             "offers_found": len(offers),
-            "offers_saved": saved_count
+            "offers_saved": counts["inserted"] + counts["updated"],
+            **counts
         }
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict
+from ..models.user import User
+from ..core.deps import get_current_admin
+from ..config import settings
+from ..services.extraction_pool import ExtractionPool, get_extraction_pool
+from ..services.skills_loader import get_dataset_version
+
+router = APIRouter(prefix="/api/skills", tags=["Skills"])
+
+
+@router.post("/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_skills(
+    current_user: User = Depends(get_current_admin),
+    pool: ExtractionPool = Depends(get_extraction_pool)
+) -> Dict:
+    """
+    Reload the skills dataset without restarting workers (admins listed in ADMIN_EMAILS)
+    
+    A new generation is built in the background and swapped in; extractions
+    already running finish on the previous one.
+    """
+    if not settings.SKILLS_RELOAD_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Skills reload is disabled"
+        )
+    
+    request = pool.reload_skills()
+    
+    return {
+        "status": "reloading",
+        "reload_request": request,
+        "dataset_version": get_dataset_version(),
+    }
@@ -8,6 +8,7 @@ from ..database import get_db
 from ..models.user import User
 from ..schemas.user import UserResponse, UserUpdate
 from ..core.deps import get_current_user
+from ..core.uploads import save_upload_file
 from ..config import settings
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
@@ -61,29 +62,25 @@ async def upload_photo(
             detail="Only JPG, JPEG, and PNG images are allowed"
         )
     
-    # Read file and validate size
-    contents = await file.read()
-    if len(contents) > MAX_IMAGE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image size must be less than 5MB"
-        )
-    
     # Generate unique filename
     extension = file.filename.split(".")[-1]
     filename = f"{current_user.id}_{int(time.time())}.{extension}"
     file_path = os.path.join(settings.AVATAR_DIR, filename)
     
-    # Delete old photo if exists
+    # Stream new photo to disk (size checked while copying)
+    await save_upload_file(
+        file,
+        file_path,
+        max_size=MAX_IMAGE_SIZE,
+        too_large_detail="Image size must be less than 5MB"
+    )
+    
+    # Delete old photo if exists (only once the new one is stored)
     if current_user.photo_profil:
         old_path = os.path.join(settings.AVATAR_DIR, current_user.photo_profil)
-        if os.path.exists(old_path):
+        if os.path.exists(old_path) and old_path != file_path:
             os.remove(old_path)
     
-    # Save new photo
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    
     # Update database - stocker le chemin relatif pour accès via URL
     current_user.photo_profil = f"/uploads/avatars/{filename}"
     db.commit()
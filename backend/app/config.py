@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import List
 import os
 
 
@@ -12,15 +13,67 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     
+    # Administration (endpoints réservés: rechargement des compétences)
+    ADMIN_EMAILS: List[str] = []  # Comptes administrateurs, ex: '["admin@smarthire.ma"]' dans .env
+    
     # Upload directories
     UPLOAD_DIR: str = "./uploads"
     AVATAR_DIR: str = "./uploads/avatars"
     CV_DIR: str = "./uploads/cvs"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     
+    # CV extraction pool
+    EXTRACTION_WORKERS: int = 2  # Processus d'extraction (0 = thread du worker)
+    EXTRACTION_MAX_PENDING: int = 8  # Au-delà: 503
+    EXTRACTION_TIMEOUT: int = 60  # Secondes par extraction (la requête échoue, le job finit dans son processus)
+    CV_JOB_STORE: str = "memory"  # "memory" (un seul worker) ou "database"
+    CV_JOB_TTL: int = 3600  # Store "memory": jobs terminés oubliés après (s)
+    CV_JOB_MAX_FINISHED: int = 1000  # Store "memory": jobs terminés gardés au plus
+    EXTRACTION_DEBUG_TIMINGS: bool = False  # Durées par étape dans la réponse d'upload
+    METRICS_ENABLED: bool = True  # Endpoint /metrics (format texte Prometheus)
+    
+    # Extraction cache (clé: SHA-256 du fichier + version dataset + version extracteur)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_DIR: str = "./cache/extractions"
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 1000
+    EXTRACTION_CACHE_TTL: int = 604800  # 7 jours
+    EXTRACTION_CACHE_EVICT_INTERVAL: int = 50  # Éviction (parcours du dossier) tous les N enregistrements
+    
+    # PDF extraction
+    PDF_MAX_PAGES: int = 20  # Pages au-delà ignorées
+    PDF_PAGE_WORKERS: int = 0  # Processus de pages par processus d'extraction (x EXTRACTION_WORKERS au total, 0 = séquentiel)
+    PDF_PAGES_DEADLINE: float = 10.0  # Échéance de l'ensemble des pages d'un PDF en mode parallèle (secondes)
+    
+    # OCR (pages scannées et photos)
+    OCR_DPI: int = 300  # Résolution cible pour tesseract
+    OCR_MAX_PIXELS: int = 12000000  # Au-delà: image réduite avant OCR
+    OCR_MAX_CONCURRENCY: int = 2  # Appels tesseract simultanés par processus
+    
+    # Budget de traitement par CV (au-delà: résultat partiel marqué `truncated`)
+    EXTRACTION_MAX_CHARS: int = 30000  # Texte analysé (caractères)
+    EXTRACTION_MAX_PIXELS: int = 40000000  # Pixels passés à l'OCR (pages scannées, photos)
+    EXTRACTION_DEADLINE: float = 30.0  # Secondes par CV (étapes restantes sautées)
+    
+    # Skills matching
+    SKILLS_FUZZY_BACKEND: str = "cdist"  # "cdist" (vectorisé), "ngram" (indexé) ou "extract"
+    SKILLS_FUZZY_WORKERS: int = 1  # Threads rapidfuzz (-1 = tous les coeurs)
+    SKILLS_INDEX_ENABLED: bool = True  # Index compilé .skidx s'il est à jour (postings de trigrammes mappés, automate recopié)
+    SKILLS_INDEX_AUTOBUILD: bool = True  # Réécrit l'index quand le JSON a changé
+    SKILLS_RELOAD_INTERVAL: float = 30.0  # Vérification du dataset sur disque par un thread de fond (s, 0 = jamais)
+    SKILLS_RELOAD_ENABLED: bool = True  # Endpoint POST /api/skills/reload
+    
     # Scraping
     SCRAPING_ENABLED: bool = True
     SCRAPING_MAX_OFFERS: int = 50
+    SCRAPING_MAX_PAGES: int = 20  # Pages de liste parcourues au plus
+    SCRAPING_CONCURRENCY: int = 4  # Requêtes simultanées par site
+    SCRAPING_RATE: float = 4.0  # Requêtes/s par site (token bucket, 0 = illimité)
+    SCRAPING_BURST: int = 4  # Rafale autorisée par le token bucket
+    SCRAPING_RETRIES: int = 3  # Nouvelles tentatives (erreurs réseau, 429, 5xx)
+    SCRAPING_TIMEOUT: float = 15.0  # Timeout HTTP par requête (s)
+    SCRAPING_MAX_RETRY_DELAY: float = 15.0  # Attente max. avant une nouvelle tentative (Retry-After borné)
+    SCRAPING_FETCH_DETAILS: bool = True  # Récupère la page de détail de chaque offre
+    SCRAPING_UPSERT_BATCH_SIZE: int = 1000  # Offres par INSERT ... ON CONFLICT
     
     class Config:
         env_file = ".env"
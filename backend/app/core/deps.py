@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models.user import User
+from ..config import settings
 from .security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -35,3 +36,13 @@ def get_current_user(
         raise credentials_exception
     
     return user
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Get current user, who must be listed in ADMIN_EMAILS"""
+    if current_user.email.lower() not in {email.lower() for email in settings.ADMIN_EMAILS}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required"
+        )
+    return current_user
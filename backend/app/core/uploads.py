@@ -0,0 +1,74 @@
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+# Read uploads in small chunks: peak memory per upload stays in the tens of KB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+
+def _default_file_mode() -> int:
+    """Mode a plain open() would give a new file (0666 minus the process umask)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once at import: os.umask() is process-wide, toggling it while other
+# threads create files would race
+UPLOAD_FILE_MODE = _default_file_mode()
+
+
+def _copy_upload(source: BinaryIO, dest_path: str, max_size: int, too_large_detail: str) -> str:
+    """Blocking part of save_upload_file (runs in the threadpool)"""
+    dest_dir = os.path.dirname(dest_path) or "."
+    digest = hashlib.sha256()
+    size = 0
+    
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=too_large_detail
+                    )
+                
+                digest.update(chunk)
+                out.write(chunk)
+        
+        # mkstemp creates the file 0600: restore the usual permissions so
+        # /uploads static serving and other processes can still read it
+        os.chmod(tmp_path, UPLOAD_FILE_MODE)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return digest.hexdigest()
+
+
+async def save_upload_file(
+    file: UploadFile,
+    dest_path: str,
+    max_size: int,
+    too_large_detail: str
+) -> str:
+    """
+    Stream an upload to dest_path and return its SHA-256 hex digest
+    
+    The body is copied chunk by chunk into a temporary file next to the
+    destination, aborting as soon as max_size is crossed, then renamed
+    atomically so a partial file is never visible under dest_path.
+    The copy runs in the threadpool: disk writes never block the event loop.
+    """
+    return await run_in_threadpool(_copy_upload, file.file, dest_path, max_size, too_large_detail)
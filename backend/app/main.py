@@ -1,10 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from .database import engine, Base
 from .config import settings, create_upload_dirs
-from .api import auth, users, cvs, offers
+from .api import auth, users, cvs, offers, skills
+from .services.extraction_pool import extraction_pool
+from .services.extraction_metrics import render_metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -43,6 +46,7 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(cvs.router)
 app.include_router(offers.router)
+app.include_router(skills.router)
 
 # Root endpoint
 @app.get("/")
@@ -52,16 +56,37 @@ def root():
 # Health check endpoint
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "extraction": extraction_pool.stats(),
+    }
+
+# Prometheus metrics (per uvicorn worker process)
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    # Start the CV extraction pool (warmed extractor in each child process)
+    extraction_pool.start()
+    
     print("\n" + "="*50)
     print("🚀 SmartHire API Started")
     print("="*50)
     print(f"📚 Documentation: http://localhost:8080/docs")
     print(f"🔍 Alternative docs: http://localhost:8080/redoc")
     print(f"💾 Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'configured'}")
+    print(f"⏱️  CV extraction pool ready in {extraction_pool.init_seconds:.2f}s "
+          f"({extraction_pool.max_workers} workers)")
     print("="*50 + "\n")
+
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    extraction_pool.shutdown()
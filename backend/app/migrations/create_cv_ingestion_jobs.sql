@@ -0,0 +1,14 @@
+-- Table des jobs d'ingestion asynchrone de CV (POST /api/cvs/upload/async)
+CREATE TABLE IF NOT EXISTS cv_ingestion_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    nom_fichier VARCHAR(255) NOT NULL,
+    cv_id INTEGER REFERENCES cvs(id) ON DELETE SET NULL,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_cv_ingestion_jobs_user_id ON cv_ingestion_jobs (user_id);
@@ -1,5 +1,6 @@
 from .user import User
 from .cv import CV
 from .offer import ScrapedOffer
+from .cv_job import CVIngestionJob
 
-__all__ = ["User", "CV", "ScrapedOffer"]
+__all__ = ["User", "CV", "ScrapedOffer", "CVIngestionJob"]
@@ -1,7 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, func
-from sqlalchemy.dialects.postgresql import JSONB
+from datetime import date
+from sqlalchemy import (
+    Column, Integer, String, Text, Date, DateTime, Boolean, Computed, Index, DDL, event, func,
+    literal_column
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from ..database import Base
 
+# Configurations de recherche plein texte (offres en français et en anglais)
+SEARCH_CONFIGS = ("french", "english")
+
+# Vecteur de recherche: titre (poids A) au-dessus de la description (poids B),
+# chacun analysé dans les deux langues
+SEARCH_VECTOR_EXPRESSION = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (("titre", "A"), ("description", "B"))
+    for config in SEARCH_CONFIGS
+)
+
 
 class ScrapedOffer(Base):
     __tablename__ = "scraped_offers"
@@ -11,7 +27,7 @@ class ScrapedOffer(Base):
     entreprise = Column(String(200), nullable=True)
     description = Column(Text, nullable=False)
     localisation = Column(String(100), nullable=True)
-    ville = Column(String(100), nullable=True, index=True)
+    ville = Column(String(100), nullable=True)
     type_contrat = Column(String(50), nullable=True)
     salaire = Column(String(100), nullable=True)
     url_source = Column(Text, unique=True, nullable=False)
@@ -22,5 +38,37 @@ class ScrapedOffer(Base):
     est_active = Column(Boolean, default=True, index=True)
     date_scraping = Column(DateTime, server_default=func.now())
     created_at = Column(DateTime, server_default=func.now())
+    
+    # Colonne générée par PostgreSQL (jamais écrite par l'application),
+    # différée: elle n'est pas chargée avec les offres
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+    
+    __table_args__ = (
+        Index("ix_scraped_offers_search_vector", "search_vector", postgresql_using="gin"),
+        # Filtres ILIKE '%...%' sur la ville et le contrat (un B-tree ne sert pas)
+        Index("ix_scraped_offers_ville_trgm", "ville",
+              postgresql_using="gin", postgresql_ops={"ville": "gin_trgm_ops"}),
+        Index("ix_scraped_offers_type_contrat_trgm", "type_contrat",
+              postgresql_using="gin", postgresql_ops={"type_contrat": "gin_trgm_ops"}),
+    )
+
+
+# Date de tri des offres sans date de publication (classées après toutes les autres)
+UNDATED_SORT_DATE = date(1, 1, 1)
+
+# Clé de tri des listes d'offres (pagination par curseur): date, puis id
+OFFER_SORT_DATE = func.coalesce(
+    ScrapedOffer.date_publication,
+    literal_column(f"DATE '{UNDATED_SORT_DATE.isoformat()}'"),
+)
+Index("ix_scraped_offers_listing", OFFER_SORT_DATE.desc(), ScrapedOffer.id.desc())
+
+
+# Les index trigrammes ont besoin de l'extension pg_trgm (à créer avant la table)
+event.listen(
+    ScrapedOffer.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
 
 
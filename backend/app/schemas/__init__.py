@@ -1,5 +1,5 @@
 from .user import UserCreate, UserLogin, UserResponse, UserUpdate, Token, TokenData
-from .cv import CVUpload, CVResponse
+from .cv import CVUpload, CVResponse, CVJobResponse
 from .offer import OfferResponse, OfferSearch
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     "TokenData",
     "CVUpload",
     "CVResponse",
+    "CVJobResponse",
     "OfferResponse",
     "OfferSearch",
 ]
@@ -20,17 +20,31 @@ class CVExtractedData(BaseModel):
     formation: List[Dict[str, Any]] = []
     langues: List[str] = []
     contenu_texte: str = ""
+    truncated: bool = False  # Budget de traitement atteint: extraction partielle
 
 
 class CVUploadResponse(BaseModel):
     """Réponse après upload du CV avec données extraites"""
     id: int
     extracted_data: CVExtractedData
+    timings: Optional[Dict[str, float]] = None  # Durées par étape (EXTRACTION_DEBUG_TIMINGS)
     
     class Config:
         from_attributes = True
 
 
+class CVJobResponse(BaseModel):
+    """État d'un job d'ingestion asynchrone de CV"""
+    id: str
+    status: str  # queued, running, done, failed
+    cv_id: Optional[int] = None
+    extracted_data: Optional[CVExtractedData] = None
+    timings: Optional[Dict[str, float]] = None  # Durées par étape (EXTRACTION_DEBUG_TIMINGS)
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class CVUpdateData(BaseModel):
     """Données vérifiées et corrigées par l'utilisateur"""
     cv_id: int
@@ -25,6 +25,12 @@ class OfferResponse(BaseModel):
         from_attributes = True
 
 
+class OfferPage(BaseModel):
+    """Page d'offres (pagination par curseur)"""
+    items: List[OfferResponse]
+    next_cursor: Optional[str] = None  # Absent sur la dernière page
+
+
 class OfferSearch(BaseModel):
     ville: Optional[str] = None
     type_contrat: Optional[str] = None
@@ -1,6 +1,18 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from ..models.offer import ScrapedOffer
+from ..config import settings
+
+# Offer fields written by the scrapers (url_source is the upsert key)
+OFFER_CONTENT_COLUMNS = (
+    "titre", "entreprise", "description", "localisation", "ville", "type_contrat",
+    "salaire", "source_site", "date_publication", "competences_requises",
+    "competences_souhaitees",
+)
 
 
 class BaseScraper(ABC):
@@ -14,14 +26,61 @@ class BaseScraper(ABC):
         """Scrape job offers and return list of offer dictionaries"""
         pass
     
+    async def scrape_async(self) -> List[Dict]:
+        """Scrape without blocking the event loop (scrapers with an async crawler override this)"""
+        return await asyncio.to_thread(self.scrape)
+    
     @abstractmethod
     def parse_offer(self, html) -> Dict:
         """Parse a single offer HTML and return offer dictionary"""
         pass
     
-    @abstractmethod
-    def save_to_db(self, offers: List[Dict], db: Session) -> int:
-        """Save offers to database and return count of saved offers"""
-        pass
+    def save_to_db(self, offers: List[Dict], db: Session) -> Dict[str, int]:
+        """
+        Upsert offers by url_source, in batches of SCRAPING_UPSERT_BATCH_SIZE
+        
+        One INSERT ... ON CONFLICT (url_source) DO UPDATE per batch; an
+        existing row is only rewritten when one of its fields changed.
+        
+        Returns:
+            Counts of inserted, updated and unchanged offers
+        """
+        # Last occurrence wins: a statement cannot update the same row twice
+        by_url = {
+            offer["url_source"]: {column: offer.get(column) for column in OFFER_CONTENT_COLUMNS}
+            for offer in offers if offer.get("url_source")
+        }
+        rows = [dict(values, url_source=url) for url, values in by_url.items()]
+        
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        batch_size = settings.SCRAPING_UPSERT_BATCH_SIZE
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            stmt = insert(ScrapedOffer).values(batch)
+            changed = or_(*(
+                getattr(ScrapedOffer, column).is_distinct_from(stmt.excluded[column])
+                for column in OFFER_CONTENT_COLUMNS
+            ))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ScrapedOffer.url_source],
+                set_={
+                    **{column: stmt.excluded[column] for column in OFFER_CONTENT_COLUMNS},
+                    "date_scraping": func.now(),
+                },
+                where=changed,
+            ).returning(
+                # xmax is 0 for a freshly inserted row; rows skipped by the
+                # WHERE clause (unchanged) are not returned
+                literal_column("xmax = 0").label("inserted")
+            )
+            
+            written = db.execute(stmt).scalars().all()
+            inserted = sum(1 for was_inserted in written if was_inserted)
+            counts["inserted"] += inserted
+            counts["updated"] += len(written) - inserted
+            counts["unchanged"] += len(batch) - len(written)
+        
+        db.commit()
+        return counts
 
 
@@ -0,0 +1,129 @@
+"""
+Asynchronous HTTP fetcher shared by the scrapers
+
+- One pooled httpx.AsyncClient per crawl (keep-alive connections reused
+  across listing and detail pages)
+- Per-host concurrency limit and token-bucket rate limit, so a crawl
+  can run many requests at once without hammering a single site
+- Retries with exponential backoff and jitter on network errors,
+  429 and 5xx responses (Retry-After honoured when present, capped at
+  max_retry_delay)
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+# Responses worth retrying (rate limited, server-side failures)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket: `rate` requests per second, bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # Waiters are served in order: the lock is held while sleeping
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Pooled async HTTP client with per-host limits and retries (async context manager)"""
+
+    def __init__(self, concurrency: int, rate: float, burst: int, retries: int,
+                 timeout: float, headers: Optional[Dict[str, str]] = None,
+                 backoff: float = 0.5, max_retry_delay: Optional[float] = None):
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.backoff = backoff
+        # A server's Retry-After must not stall the crawl longer than a request
+        self.max_retry_delay = timeout if max_retry_delay is None else max_retry_delay
+        self.client: Optional[httpx.AsyncClient] = None
+        # Host -> (concurrency semaphore, rate limiter)
+        self._hosts: Dict[str, Tuple[asyncio.Semaphore, TokenBucket]] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency * 4,
+                max_keepalive_connections=self.concurrency * 4,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    def _host_limits(self, url: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = (
+                asyncio.Semaphore(self.concurrency),
+                TokenBucket(self.rate, self.burst),
+            )
+        return self._hosts[host]
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Exponential backoff with full jitter (or the server's Retry-After)"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_retry_delay)
+        return min(random.uniform(0, self.backoff * 2 ** attempt), self.max_retry_delay)
+
+    async def get(self, url: str) -> str:
+        """
+        Fetch a page and return its text
+
+        Raises:
+            httpx.HTTPError: once the retries are exhausted (or on a
+            non-retryable error status such as 404)
+        """
+        semaphore, bucket = self._host_limits(url)
+
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                async with semaphore:
+                    await bucket.acquire()
+                    response = await self.client.get(url)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.text
+                error = httpx.HTTPStatusError(
+                    f"{response.status_code} for {url}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt == self.retries:
+                raise error
+            # Sleep outside the semaphore: other requests use the slot meanwhile
+            await asyncio.sleep(self._retry_delay(attempt, response))
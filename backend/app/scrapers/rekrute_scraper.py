@@ -1,13 +1,15 @@
-import requests
+import asyncio
+import math
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
-from typing import List, Dict
-from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import List, Dict, Optional
 from .base_scraper import BaseScraper
-from ..models.offer import ScrapedOffer
+from .http_fetcher import AsyncFetcher
 from ..config import settings
 
+# Limit description length
+DESCRIPTION_MAX_LENGTH = 1000
+
 
 class RekruteScraper(BaseScraper):
     """Scraper for Rekrute.com job offers"""
@@ -20,38 +22,140 @@ class RekruteScraper(BaseScraper):
         self.ua = UserAgent()
     
     def scrape(self) -> List[Dict]:
-        """Scrape job offers from Rekrute.com"""
+        """Scrape job offers from Rekrute.com (blocking wrapper around scrape_async)"""
+        return asyncio.run(self.scrape_async())
+    
+    async def scrape_async(self) -> List[Dict]:
+        """
+        Crawl Rekrute.com listing pages until SCRAPING_MAX_OFFERS offers are found
+        
+        Page 1 is fetched alone to learn how many offers a page holds; the
+        following listing pages are fetched in waves of up to
+        SCRAPING_CONCURRENCY pages, never more than the offers still needed
+        can fill. Each offer's detail page is fetched as soon as its card is parsed,
+        overlapping with the next listing wave. The crawl stops at the first
+        page (in page order) with no new offer; a page that still fails
+        after the retries is skipped.
+        """
         offers = []
+        seen_urls = set()
+        detail_tasks = []
+        max_offers = settings.SCRAPING_MAX_OFFERS
         
-        try:
-            headers = {
-                "User-Agent": self.ua.random,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
-            }
-            
-            response = requests.get(self.offers_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Find job offer cards (adjust selectors based on actual website structure)
-            offer_cards = soup.find_all("div", class_="post-id")[:settings.SCRAPING_MAX_OFFERS]
-            
-            for card in offer_cards:
-                try:
-                    offer = self.parse_offer(card)
-                    if offer:
+        async with AsyncFetcher(
+            concurrency=settings.SCRAPING_CONCURRENCY,
+            rate=settings.SCRAPING_RATE,
+            burst=settings.SCRAPING_BURST,
+            retries=settings.SCRAPING_RETRIES,
+            timeout=settings.SCRAPING_TIMEOUT,
+            max_retry_delay=settings.SCRAPING_MAX_RETRY_DELAY,
+            headers=self._headers(),
+        ) as fetcher:
+            page = 1
+            per_page = 0  # Most offers seen on one listing page (0 = not known yet)
+            exhausted = False
+            while not exhausted and len(offers) < max_offers and page <= settings.SCRAPING_MAX_PAGES:
+                wave = 1
+                if per_page:
+                    wave = min(settings.SCRAPING_CONCURRENCY, math.ceil((max_offers - len(offers)) / per_page))
+                last_page = min(page + max(1, wave), settings.SCRAPING_MAX_PAGES + 1)
+                listings = await asyncio.gather(
+                    *(self._fetch_listing(fetcher, number) for number in range(page, last_page))
+                )
+                page = last_page
+                
+                # Pages are consumed in order so the offer order matches the site's
+                for cards in listings:
+                    if cards is None:
+                        # Fetch failed after retries: skip the page, keep the later ones
+                        continue
+                    per_page = max(per_page, len(cards))
+                    new_offers = 0
+                    for offer in cards:
+                        if len(offers) >= max_offers:
+                            break
+                        # Offers without a URL cannot be deduplicated (url_source is unique)
+                        if not offer["url_source"] or offer["url_source"] in seen_urls:
+                            continue
+                        seen_urls.add(offer["url_source"])
                         offers.append(offer)
-                except Exception as e:
-                    print(f"Error parsing offer: {e}")
-                    continue
+                        new_offers += 1
+                        if settings.SCRAPING_FETCH_DETAILS:
+                            detail_tasks.append(asyncio.create_task(self._fetch_detail(fetcher, offer)))
+                    # Past the last page the site serves no offers (or the same ones again)
+                    if new_offers == 0 or len(offers) >= max_offers:
+                        exhausted = True
+                        break
+            
+            await asyncio.gather(*detail_tasks)
         
+        return offers
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "User-Agent": self.ua.random,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
+        }
+    
+    def listing_url(self, page: int) -> str:
+        return self.offers_url if page == 1 else f"{self.offers_url}?p={page}"
+    
+    async def _fetch_listing(self, fetcher: AsyncFetcher, page: int) -> Optional[List[Dict]]:
+        """Offers of one listing page (None if the page could not be fetched)"""
+        try:
+            html = await fetcher.get(self.listing_url(page))
+            # HTML parsing is CPU-bound: keep it off the event loop
+            return await asyncio.to_thread(self.parse_listing, html)
         except Exception as e:
-            print(f"Error scraping Rekrute: {e}")
+            print(f"Error scraping Rekrute listing page {page}: {e}")
+            return None
+    
+    async def _fetch_detail(self, fetcher: AsyncFetcher, offer: Dict):
+        """Complete an offer with its detail page (the card data is kept on failure)"""
+        try:
+            html = await fetcher.get(offer["url_source"])
+            offer.update(await asyncio.to_thread(self.parse_offer_detail, html))
+        except Exception as e:
+            print(f"Error scraping offer detail {offer['url_source']}: {e}")
+    
+    def parse_listing(self, html: str) -> List[Dict]:
+        """Parse the offer cards of a listing page"""
+        soup = BeautifulSoup(html, "html.parser")
+        offers = []
+        
+        # Find job offer cards (adjust selectors based on actual website structure)
+        for card in soup.find_all("div", class_="post-id"):
+            try:
+                offer = self.parse_offer(card)
+                if offer:
+                    offers.append(offer)
+            except Exception as e:
+                print(f"Error parsing offer: {e}")
+                continue
         
         return offers
     
+    def parse_offer_detail(self, html: str) -> Dict:
+        """Parse an offer detail page: fields that complete or replace the card's"""
+        soup = BeautifulSoup(html, "html.parser")
+        details = {}
+        
+        # Full description (the card only has an excerpt)
+        desc_elem = (soup.find("div", id="recruiterDescription")
+                     or soup.find("div", class_="description")
+                     or soup.find("div", class_="contentbloc"))
+        if desc_elem:
+            description = desc_elem.get_text(" ", strip=True)
+            if description:
+                details["description"] = description[:DESCRIPTION_MAX_LENGTH]
+        
+        contract_elem = soup.find("span", class_="contrat") or soup.find("span", class_="tagContrat")
+        if contract_elem:
+            details["type_contrat"] = contract_elem.get_text(strip=True)
+        
+        return details
+    
     def parse_offer(self, card) -> Dict:
         """Parse a single offer card"""
         try:
@@ -86,7 +190,7 @@ class RekruteScraper(BaseScraper):
             return {
                 "titre": titre,
                 "entreprise": entreprise,
-                "description": description[:1000],  # Limit description length
+                "description": description[:DESCRIPTION_MAX_LENGTH],
                 "localisation": localisation,
                 "ville": ville,
                 "type_contrat": type_contrat,
@@ -101,35 +205,3 @@ class RekruteScraper(BaseScraper):
         except Exception as e:
             print(f"Error in parse_offer: {e}")
             return None
-    
-    def save_to_db(self, offers: List[Dict], db: Session) -> int:
-        """Save offers to database"""
-        saved_count = 0
-        
-        for offer_data in offers:
-            try:
-                # Check if offer already exists (by URL)
-                existing = db.query(ScrapedOffer).filter(
-                    ScrapedOffer.url_source == offer_data["url_source"]
-                ).first()
-                
-                if existing:
-                    # Update existing offer
-                    for key, value in offer_data.items():
-                        setattr(existing, key, value)
-                    existing.date_scraping = datetime.utcnow()
-                else:
-                    # Create new offer
-                    new_offer = ScrapedOffer(**offer_data)
-                    db.add(new_offer)
-                
-                saved_count += 1
-            
-            except Exception as e:
-                print(f"Error saving offer: {e}")
-                continue
-        
-        db.commit()
-        return saved_count
-
-
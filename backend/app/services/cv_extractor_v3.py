@@ -24,22 +24,38 @@ if sys.platform == 'win32':
 
 import re
 import json
-from typing import Dict, List, Optional, Tuple, Set
+import time
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Set
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
 
-# PDF & Image processing
-import pdfplumber
-from PIL import Image
-import pytesseract
-
-# Text processing
-from rapidfuzz import fuzz, process
-from dateutil import parser as date_parser
+# PDF & Image processing: pdfplumber, PIL et pytesseract sont importés à la
+# première utilisation (ou par warmup()) pour que l'import du module reste léger
+if TYPE_CHECKING:
+    from PIL import Image
 
 # Skills loader
-from .skills_loader import get_skills_loader
+from .skills_loader import SkillsLoader, get_skills_loader
+from .section_classifier import SectionClassifier
+from .pdf_layout import words_to_lines
+from .extraction_metrics import StageTimer, TOTAL_STAGE
+from .extraction_budget import (
+    ProcessingBudget, cap_lines, TRUNCATED_PAGES, TRUNCATED_CHARS
+)
+from ..config import settings
+
+# Version de la logique d'extraction: à incrémenter quand le résultat change
+# (invalide le cache des extractions)
+EXTRACTOR_VERSION = "3.6"
+
+# En dessous de ce nombre de pages, le mode parallèle coûte plus qu'il ne rapporte
+PARALLEL_MIN_PAGES = 3
+
+# Langues tesseract
+OCR_LANG = 'fra+eng'
 
 
 class CVExtractorV3:
@@ -48,14 +64,22 @@ class CVExtractorV3:
     def __init__(self):
         print("🚀 Initialisation CV Extractor V3...")
         
-        # Charger le dataset de compétences
-        self.skills_loader = get_skills_loader()
+        # Génération du référentiel figée pour l'extraction en cours (par thread):
+        # un rechargement à chaud ne change pas le dataset au milieu d'un CV
+        self._local = threading.local()
         
         # Patterns de dates ÉTENDUS (tous séparateurs)
         self.date_patterns = self._init_date_patterns()
         
+        # Variantes de noms de langues -> langue
+        self.language_variations = self._init_language_variations()
+        
+        # Regex compilées une seule fois (dates, contact, langues, nom)
+        self.regex = self._init_regex_bank()
+        
         # Patterns de sections avec variations
         self.section_patterns = self._init_section_patterns()
+        self.section_classifier = SectionClassifier(self.section_patterns)
         
         # Stopwords étendus (mots à exclure)
         self.excluded_words = self._init_excluded_words()
@@ -63,6 +87,16 @@ class CVExtractorV3:
         # Villes et pays
         self.cities = self._init_cities()
         
+        # Extraction PDF: plafond de pages et parallélisme par page
+        self.max_pages = settings.PDF_MAX_PAGES
+        self.page_workers = settings.PDF_PAGE_WORKERS
+        self.pages_deadline = settings.PDF_PAGES_DEADLINE
+        
+        # Budget de traitement par CV (au-delà: résultat partiel `truncated`)
+        self.max_chars = settings.EXTRACTION_MAX_CHARS
+        self.max_pixels = settings.EXTRACTION_MAX_PIXELS
+        self.deadline = settings.EXTRACTION_DEADLINE
+        
         # Niveaux de langues CEFR
         self.language_levels = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2',
                                 'débutant', 'intermédiaire', 'avancé', 'courant', 'natif',
@@ -72,20 +106,81 @@ class CVExtractorV3:
         stats = self.skills_loader.get_stats()
         print(f"   📊 Dataset: {stats['total_skills']} compétences chargées")
     
-    def _init_date_patterns(self) -> List[str]:
-        """Patterns de dates multi-format avec TOUS les séparateurs"""
-        return [
+    def _init_date_patterns(self) -> Dict[str, str]:
+        """
+        Patterns de dates multi-format avec TOUS les séparateurs
+        
+        L'ordre compte: ils sont fusionnés en une seule alternation, la
+        première branche qui matche à une position donnée l'emporte.
+        """
+        return {
+            # Année scolaire
+            'school_year': r'\d{4}[\s]*[-–—/]\s*\d{4}',
             # Mois texte + année
-            r'(?:jan(?:v(?:ier)?)?|f[ée]v(?:r(?:ier)?)?|mar(?:s)?|avr(?:il)?|mai|juin?|juil(?:let)?|ao[ûu](?:t)?|sep(?:t(?:embre)?)?|oct(?:obre)?|nov(?:embre)?|d[ée]c(?:embre)?|january|february|march|april|may|june|july|august|september|october|november|december)\.?\s*\d{4}',
+            'month_text': r'(?:jan(?:v(?:ier)?)?|f[ée]v(?:r(?:ier)?)?|mar(?:s)?|avr(?:il)?|mai|juin?|juil(?:let)?|ao[ûu](?:t)?|sep(?:t(?:embre)?)?|oct(?:obre)?|nov(?:embre)?|d[ée]c(?:embre)?|january|february|march|april|may|june|july|august|september|october|november|december)\.?\s*\d{4}',
+            # Trimestre
+            'quarter': r'Q[1-4]\s*\d{4}',
             # MM/YYYY ou MM-YYYY
-            r'\d{1,2}[/-]\d{4}',
+            'month_year': r'\d{1,2}[/-]\d{4}',
             # YYYY seul
-            r'\b(?:19|20)\d{2}\b',
-            # Trimestre
-            r'Q[1-4]\s*\d{4}',
-            # Année scolaire
-            r'\d{4}[\s]*[-–—/]\s*\d{4}',
-        ]
+            'year': r'\b(?:19|20)\d{2}\b',
+            # Mots de fin de période
+            'present': r"present|aujourd'hui|current|actuel|en cours|now|ongoing|toujours|ce jour",
+        }
+    
+    def _init_language_variations(self) -> Dict[str, str]:
+        """Variantes (minuscules) des noms de langues -> nom normalisé"""
+        lang_variations = {
+            'Français': ['français', 'francais', 'french'],
+            'Anglais': ['anglais', 'english'],
+            'Arabe': ['arabe', 'arabic'],
+            'Espagnol': ['espagnol', 'spanish'],
+            'Allemand': ['allemand', 'german'],
+            'Italien': ['italien', 'italian'],
+            'Portugais': ['portugais', 'portuguese'],
+            'Chinois': ['chinois', 'chinese', 'mandarin'],
+        }
+        return {var: lang for lang, variations in lang_variations.items() for var in variations}
+    
+    def _init_regex_bank(self) -> Dict[str, object]:
+        """
+        Registre des regex compilées, construit une fois par extracteur
+        
+        Les patterns de dates sont fusionnés en une alternation à groupes
+        nommés et les variantes de langues en un seul pattern: chaque texte
+        est parcouru une fois au lieu d'une fois par pattern.
+        """
+        date_alternation = '|'.join(
+            f'(?P<{name}>{pattern})' for name, pattern in self.date_patterns.items()
+        )
+        # Variantes les plus longues d'abord ('french' avant un éventuel préfixe)
+        language_alternation = '|'.join(
+            re.escape(var) for var in sorted(self.language_variations, key=len, reverse=True)
+        )
+        return {
+            'date': re.compile(date_alternation, re.IGNORECASE),
+            # Contexte (niveau) en lookahead: il peut contenir la langue suivante
+            'language': re.compile(r'\b(' + language_alternation + r')(?=[\s:]*([^\n,;]{0,30}))'),
+            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+            # Téléphones, par ordre de priorité
+            'phones': [
+                # International
+                re.compile(r'\+\d{1,3}[\s.-]?\d{1,3}[\s.-]?\d{3,4}[\s.-]?\d{3,4}'),
+                # Avec parenthèses
+                re.compile(r'\+?\d{1,3}[\s.-]?\(?\d{2,3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'),
+                # Standard
+                re.compile(r'\d{3}[\s.-]\d{3}[\s.-]\d{4}'),
+                # Marocain
+                re.compile(r'(?:\+212|0)[5-7]\d{8}|(?:\+212|0)[5-7](?:[\s.-]?\d{2}){4}'),
+                # Simple
+                re.compile(r'\b\d{10}\b'),
+            ],
+            'phone_noise': re.compile(r'[^\d+]'),
+            'year_prefix': re.compile(r'^(19|20)\d{2}'),
+            'sentence_end': re.compile(r'[.!?]$'),
+            'contact_line': re.compile(r'@|\.com|http|www|\d{5,}'),
+            'name_word': re.compile(r'^[A-ZÀ-ÿa-z\'-]+$'),
+        }
     
     def _init_section_patterns(self) -> Dict[str, List[str]]:
         """Patterns de sections avec fuzzy matching"""
@@ -155,27 +250,121 @@ class CVExtractorV3:
     # EXTRACTION PRINCIPALE
     # ========================================================================
     
+    @property
+    def skills_loader(self) -> SkillsLoader:
+        """Génération du référentiel de l'extraction en cours, sinon la courante"""
+        return getattr(self._local, 'skills_loader', None) or get_skills_loader()
+    
+    def _span(self, stage: str):
+        """Chronomètre une étape de l'extraction en cours (sans effet hors extract_from_file)"""
+        timer = getattr(self._local, 'timer', None)
+        return timer.span(stage) if timer is not None else nullcontext()
+    
+    def _new_budget(self) -> ProcessingBudget:
+        return ProcessingBudget(self.max_pages, self.max_chars, self.max_pixels, self.deadline)
+    
+    def _budget(self) -> ProcessingBudget:
+        """Budget de l'extraction en cours (hors extract_from_file: un budget neuf)"""
+        return getattr(self._local, 'budget', None) or self._new_budget()
+    
     def extract_from_file(self, file_path: str) -> Dict:
         """Point d'entrée principal"""
         file_path = Path(file_path)
+        skills_loader = get_skills_loader()
+        timer = StageTimer()
+        budget = self._new_budget()
+        self._local.skills_loader = skills_loader
+        self._local.timer = timer
+        self._local.budget = budget
         
-        if file_path.suffix.lower() == '.pdf':
-            return self._extract_from_pdf(file_path)
-        elif file_path.suffix.lower() in ['.jpg', '.jpeg', '.png']:
-            return self._extract_from_image(file_path)
-        else:
-            raise ValueError(f"Format non supporté: {file_path.suffix}")
+        try:
+            with timer.span(TOTAL_STAGE):
+                if file_path.suffix.lower() == '.pdf':
+                    result = self._extract_from_pdf(file_path)
+                elif file_path.suffix.lower() in ['.jpg', '.jpeg', '.png']:
+                    result = self._extract_from_image(file_path)
+                else:
+                    raise ValueError(f"Format non supporté: {file_path.suffix}")
+        finally:
+            self._local.skills_loader = None
+            self._local.timer = None
+            self._local.budget = None
+        
+        # Résultat partiel si une limite du budget a été atteinte
+        result["truncated"] = bool(budget.truncated)
+        result["truncated_reasons"] = budget.truncated
+        # Dataset et moteur fuzzy réellement utilisés (clé du cache des
+        # extractions) et génération
+        result["dataset_version"] = skills_loader.dataset_version
+        result["fuzzy_backend"] = skills_loader.fuzzy_backend
+        result["skills_generation"] = skills_loader.generation
+        # Durées par étape (secondes), enregistrées par le pool d'extraction
+        result["timings"] = timer.timings
+        return result
     
     def _extract_from_pdf(self, file_path: Path) -> Dict:
         """Extraction PDF avec tri spatial"""
+        import pdfplumber
+        
         text_blocks = []
+        budget = self._budget()
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # AMÉLIORATION: Tri spatial des blocs
-                    page_blocks = self._extract_page_spatial(page)
-                    text_blocks.extend(page_blocks)
+            with self._span('pdf_open'):
+                pdf = pdfplumber.open(file_path)
+            with pdf:
+                with self._span('pdf_open'):
+                    pages = pdf.pages
+                
+                # Plafond de pages: les pages au-delà sont ignorées
+                if len(pages) > budget.max_pages:
+                    pages = pages[:budget.max_pages]
+                    budget.truncate(TRUNCATED_PAGES)
+                
+                if self.page_workers > 0 and len(pages) >= PARALLEL_MIN_PAGES:
+                    # AMÉLIORATION: pages réparties sur plusieurs processus
+                    with self._span('pdf_pages_parallel'):
+                        text_blocks = extract_pages_parallel(
+                            file_path, len(pages), self.page_workers, self.pages_deadline, budget
+                        )
+                else:
+                    page_lines = []
+                    scanned = []  # (index, image) des pages sans couche texte
+                    chars = 0
+                    
+                    for index, page in enumerate(pages):
+                        if not budget.within_deadline():
+                            break
+                        
+                        # Premier accès aux caractères: analyse pdfminer de la page
+                        with self._span('pdf_parse'):
+                            text_layer = has_text_layer(page)
+                        if text_layer:
+                            # AMÉLIORATION: Tri spatial des blocs
+                            with self._span('pdf_text'):
+                                page_lines.append(self._extract_page_spatial(page))
+                            chars += sum(len(line) + 1 for line in page_lines[-1])
+                            # Assez de texte: les pages suivantes ne seraient pas analysées
+                            if chars > budget.max_chars and index + 1 < len(pages):
+                                budget.truncate(TRUNCATED_CHARS)
+                                break
+                        else:
+                            # Page scannée: seule celle-ci est rastérisée pour l'OCR
+                            page_lines.append([])
+                            if budget.take_pixels(raster_pixels(page)):
+                                with self._span('rasterize'):
+                                    scanned.append((index, rasterize_page(page)))
+                    
+                    if scanned and budget.within_deadline():
+                        with self._span('ocr'):
+                            ocr_lines = ocr_images([image for _, image in scanned],
+                                                   deadline=budget.deadline)
+                        # OCR interrompu par l'échéance: pages vides, troncature notée
+                        budget.within_deadline()
+                        for (index, _), lines in zip(scanned, ocr_lines):
+                            page_lines[index] = lines
+                    
+                    text_blocks = [line for lines in page_lines for line in lines]
         except Exception as e:
             print(f"❌ Erreur extraction PDF: {e}")
             return self._empty_result()
@@ -189,53 +378,31 @@ class CVExtractorV3:
         return self._parse_cv_text(full_text, text_blocks)
     
     def _extract_page_spatial(self, page) -> List[str]:
-        """
-        AMÉLIORATION: Extraction avec tri spatial (x, y)
-        Pour gérer les CV en colonnes et tableaux
-        """
-        try:
-            # Extraire les mots avec coordonnées
-            words = page.extract_words(
-                x_tolerance=3,
-                y_tolerance=3,
-                keep_blank_chars=False
-            )
-            
-            if not words:
-                # Fallback: extraction simple
-                return [page.extract_text() or ""]
-            
-            # Regrouper par lignes (même coordonnée y)
-            lines_dict = defaultdict(list)
-            
-            for word in words:
-                # Arrondir y pour grouper les mots sur la même ligne
-                y_coord = round(word['top'])
-                lines_dict[y_coord].append((word['x0'], word['text']))
-            
-            # Trier les lignes de haut en bas
-            sorted_lines = []
-            for y in sorted(lines_dict.keys()):
-                # Trier les mots de gauche à droite
-                line_words = sorted(lines_dict[y], key=lambda x: x[0])
-                line_text = ' '.join([w[1] for w in line_words])
-                sorted_lines.append(line_text)
-            
-            return sorted_lines
-        
-        except Exception as e:
-            print(f"⚠️ Spatial extraction failed, using fallback: {e}")
-            return [page.extract_text() or ""]
+        """Extraction d'une page avec tri spatial (voir extract_page_lines)"""
+        return extract_page_lines(page)
     
     def _extract_from_image(self, file_path: Path) -> Dict:
         """Extraction depuis image avec OCR"""
+        from PIL import Image
+        
+        budget = self._budget()
+        
         try:
+            # Image.open ne lit que l'en-tête: le budget de pixels est vérifié
+            # sur la taille d'origine, avant le décodage et la mise à l'échelle
             image = Image.open(file_path)
-            text = pytesseract.image_to_string(image, lang='fra+eng')
+            width, height = image.size
+            if not budget.take_pixels(width * height) or not budget.within_deadline():
+                return self._empty_result()
+            with self._span('image_prepare'):
+                image = prepare_image_for_ocr(image)
+            with self._span('ocr'):
+                text = ocr_image(image, deadline=budget.deadline)
             lines = text.split('\n')
             return self._parse_cv_text(text, lines)
         except Exception as e:
             print(f"❌ Erreur OCR: {e}")
+            budget.within_deadline()
             return self._empty_result()
     
     # ========================================================================
@@ -243,56 +410,77 @@ class CVExtractorV3:
     # ========================================================================
     
     def _parse_cv_text(self, text: str, lines: List[str]) -> Dict:
-        """Parse le texte extrait"""
+        """
+        Parse le texte extrait
+        
+        Le texte est plafonné à max_chars et l'échéance du budget est
+        vérifiée avant chaque étape: une fois dépassée, les étapes
+        restantes sont sautées (champs vides dans le résultat partiel).
+        """
         if not text or len(text.strip()) < 50:
             return self._empty_result()
         
+        budget = self._budget()
+        capped = cap_lines(lines, budget.max_chars)
+        if capped is not None:
+            budget.truncate(TRUNCATED_CHARS)
+            lines = capped
+            text = '\n'.join(lines)
+        
+        result = self._empty_result()
+        
         # AMÉLIORATION: Regroupement lignes logiques
-        lines = self._regroup_logical_lines(lines)
+        with self._span('regroup_lines'):
+            lines = self._regroup_logical_lines(lines)
         
-        # Extraction informations contact (en-tête)
-        header_text = '\n'.join(lines[:20])
+        if budget.within_deadline():
+            with self._span('name'):
+                result["nom"] = self._extract_name_intelligent(lines)
         
-        nom = self._extract_name_intelligent(lines)
-        email = self._extract_email(text)
-        telephone = self._extract_phone(text)
-        ville = self._extract_city(text)
+        if budget.within_deadline():
+            with self._span('contact'):
+                result["email"] = self._extract_email(text)
+                result["telephone"] = self._extract_phone(text)
+                result["ville"] = self._extract_city(text)
         
         # AMÉLIORATION: Détection sections avec fuzzy matching
-        sections = self._detect_sections_fuzzy(lines)
+        sections = {}
+        if budget.within_deadline():
+            with self._span('sections'):
+                sections = self._detect_sections_fuzzy(lines)
         
         # AMÉLIORATION: Extraction avec dataset multi-domaines
-        competences_data = self._extract_skills_esco(
-            text, 
-            sections.get('competences', [])
-        )
+        if budget.within_deadline():
+            with self._span('skills'):
+                competences_data = self._extract_skills_esco(
+                    text, 
+                    sections.get('competences', [])
+                )
+            result["competences_extraites"] = competences_data['technical'] + competences_data['soft']
         
-        experiences = self._extract_experiences_robust(
-            text, 
-            sections.get('experience', [])
-        )
+        if budget.within_deadline():
+            with self._span('experience'):
+                result["experience"] = self._extract_experiences_robust(
+                    text, 
+                    sections.get('experience', [])
+                )
         
-        formations = self._extract_education_robust(
-            text, 
-            sections.get('formation', [])
-        )
+        if budget.within_deadline():
+            with self._span('education'):
+                result["formation"] = self._extract_education_robust(
+                    text, 
+                    sections.get('formation', [])
+                )
         
         # AMÉLIORATION: Langues avec niveaux
-        langues = self._extract_languages_with_levels(
-            text, 
-            sections.get('langues', [])
-        )
+        if budget.within_deadline():
+            with self._span('languages'):
+                result["langues"] = self._extract_languages_with_levels(
+                    text, 
+                    sections.get('langues', [])
+                )
         
-        return {
-            "nom": nom,
-            "email": email,
-            "telephone": telephone,
-            "ville": ville,
-            "competences_extraites": competences_data['technical'] + competences_data['soft'],
-            "experience": experiences,
-            "formation": formations,
-            "langues": langues,
-        }
+        return result
     
     # ========================================================================
     # AMÉLIORATION: Regroupement lignes logiques
@@ -318,7 +506,7 @@ class CVExtractorV3:
                 continue
             
             # Si ligne courte (< 50 caractères) et pas de ponctuation finale
-            if len(line) < 50 and not re.search(r'[.!?]$', line):
+            if len(line) < 50 and not self.regex['sentence_end'].search(line):
                 current_group.append(line)
             else:
                 if current_group:
@@ -351,22 +539,8 @@ class CVExtractorV3:
             if not line_stripped:
                 continue
             
-            # Nettoyer pour matching (enlever symboles, chiffres, etc.)
-            line_clean = re.sub(r'[^\w\s]', '', line_stripped.lower())
-            line_clean = re.sub(r'\d+', '', line_clean).strip()
-            
-            # Tester chaque type de section
-            best_section = None
-            best_score = 0
-            
-            for section_name, keywords in self.section_patterns.items():
-                for keyword in keywords:
-                    # Fuzzy match
-                    score = fuzz.partial_ratio(keyword, line_clean)
-                    
-                    if score > 85 and score > best_score:
-                        best_section = section_name
-                        best_score = score
+            # Titre de section ? (lookup normalisé + fallback fuzzy borné)
+            best_section = self.section_classifier.classify(line_stripped)
             
             if best_section:
                 # Sauvegarder section précédente
@@ -401,11 +575,11 @@ class CVExtractorV3:
                 continue
             
             # Skip si email, téléphone, URL, adresse
-            if re.search(r'@|\.com|http|www|\d{5,}', line.lower()):
+            if self.regex['contact_line'].search(line.lower()):
                 continue
             
             # Skip si c'est une section
-            if any(keyword in line.lower() for patterns in self.section_patterns.values() for keyword in patterns):
+            if self.section_classifier.classify(line):
                 continue
             
             # Calculer un score
@@ -425,7 +599,7 @@ class CVExtractorV3:
                 score += 1
             
             # Critère 3: Que des lettres (pas de chiffres)
-            if all(re.match(r'^[A-ZÀ-ÿa-z\'-]+$', word) for word in words):
+            if all(self.regex['name_word'].match(word) for word in words):
                 score += 3
             
             # Critère 4: Position (plus haut = plus probable)
@@ -451,31 +625,16 @@ class CVExtractorV3:
     
     def _extract_email(self, text: str) -> str:
         """Extraction email"""
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(pattern, text)
-        return matches[0] if matches else ""
+        match = self.regex['email'].search(text)
+        return match.group(0) if match else ""
     
     def _extract_phone(self, text: str) -> str:
         """Extraction téléphone multi-format"""
-        patterns = [
-            # International
-            r'\+\d{1,3}[\s.-]?\d{1,3}[\s.-]?\d{3,4}[\s.-]?\d{3,4}',
-            # Avec parenthèses
-            r'\+?\d{1,3}[\s.-]?\(?\d{2,3}\)?[\s.-]?\d{3}[\s.-]?\d{4}',
-            # Standard
-            r'\d{3}[\s.-]\d{3}[\s.-]\d{4}',
-            # Marocain
-            r'(?:\+212|0)[5-7]\d{8}|(?:\+212|0)[5-7](?:[\s.-]?\d{2}){4}',
-            # Simple
-            r'\b\d{10}\b',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                phone_clean = re.sub(r'[^\d+]', '', match)
+        for pattern in self.regex['phones']:
+            for match in pattern.findall(text):
+                phone_clean = self.regex['phone_noise'].sub('', match)
                 if 9 <= len(phone_clean) <= 15:
-                    if not re.match(r'^(19|20)\d{2}', match):
+                    if not self.regex['year_prefix'].match(match):
                         return match.strip()
         return ""
     
@@ -502,7 +661,7 @@ class CVExtractorV3:
         skills_text = self._split_by_separators(section_text)
         
         # Rechercher avec ESCO
-        found_skills = self.esco.search_skills(section_text + ' ' + text, threshold=85)
+        found_skills = self.skills_loader.search_skills(section_text + ' ' + text, threshold=85)
         
         # Filtrer les mots exclus
         found_skills['technical'] = [
@@ -573,20 +732,19 @@ class CVExtractorV3:
         Gère: → – — > / - to à
         """
         dates = []
+        is_current = False
         
-        # Patterns de dates
-        for pattern in self.date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(matches)
-        
-        # Mots de fin de période
-        end_words = ['present', 'aujourd\'hui', 'current', 'actuel', 
-                     'en cours', 'now', 'ongoing', 'toujours', 'ce jour']
+        # Un seul parcours: les dates dans l'ordre du texte
+        for match in self.regex['date'].finditer(text):
+            if match.lastgroup == 'present':
+                is_current = True
+            elif len(dates) < 2:
+                dates.append(match.group(0))
+            if len(dates) == 2 and is_current:
+                break
         
-        for word in end_words:
-            if word in text.lower():
-                if 'Present' not in dates:
-                    dates.append('Present')
+        if is_current:
+            dates.append('Present')
         
         return dates[:2]  # Max 2 dates (début et fin)
     
@@ -642,39 +800,19 @@ class CVExtractorV3:
         AMÉLIORATION: Extraction langues avec niveaux CEFR
         Exemple: "Anglais (B2)", "Français courant", "Spanish fluent"
         """
-        languages_found = []
         search_text = ' '.join(section_lines) + ' ' + text
         search_lower = search_text.lower()
         
-        lang_variations = {
-            'Français': ['français', 'francais', 'french'],
-            'Anglais': ['anglais', 'english'],
-            'Arabe': ['arabe', 'arabic'],
-            'Espagnol': ['espagnol', 'spanish'],
-            'Allemand': ['allemand', 'german'],
-            'Italien': ['italien', 'italian'],
-            'Portugais': ['portugais', 'portuguese'],
-            'Chinois': ['chinois', 'chinese', 'mandarin'],
-        }
-        
-        for lang_name, variations in lang_variations.items():
-            for var in variations:
-                # Chercher la langue
-                pattern = r'\b' + re.escape(var) + r'[\s:]*([^\n,;]{0,30})'
-                match = re.search(pattern, search_lower)
-                
-                if match:
-                    # Extraire le niveau si présent
-                    context = match.group(1) if len(match.groups()) > 0 else ""
-                    level = self._extract_language_level(context)
-                    
-                    if level:
-                        languages_found.append(f"{lang_name} ({level})")
-                    else:
-                        languages_found.append(lang_name)
-                    break
+        # Un seul parcours: première occurrence de chaque langue
+        found = {}
+        for match in self.regex['language'].finditer(search_lower):
+            lang_name = self.language_variations[match.group(1)]
+            if lang_name in found:
+                continue
+            level = self._extract_language_level(match.group(2))
+            found[lang_name] = f"{lang_name} ({level})" if level else lang_name
         
-        return list(set(languages_found))
+        return list(found.values())
     
     def _extract_language_level(self, text: str) -> str:
         """Extrait le niveau de langue (CEFR ou descriptif)"""
@@ -723,6 +861,275 @@ class CVExtractorV3:
         }
 
 
-# Instance globale
-extractor_v3 = CVExtractorV3()
+# ============================================================================
+# Extraction PDF page par page (utilisable hors de l'extracteur)
+# ============================================================================
+
+def extract_page_lines(page) -> List[str]:
+    """
+    AMÉLIORATION: Extraction avec tri spatial (x, y)
+    Pour gérer les CV en colonnes et tableaux
+    """
+    try:
+        # Extraire les mots avec coordonnées
+        words = page.extract_words(
+            x_tolerance=3,
+            y_tolerance=3,
+            keep_blank_chars=False
+        )
+        
+        if not words:
+            # Page scannée (pas de couche texte): OCR de la page seule
+            return ocr_image(prepare_image_for_ocr(rasterize_page(page))).split('\n')
+        
+        # Lignes dans l'ordre de lecture (colonnes détectées par gouttières)
+        return words_to_lines(words)
+    
+    except Exception as e:
+        print(f"⚠️ Spatial extraction failed, using fallback: {e}")
+        return [page.extract_text() or ""]
+
+
+# ============================================================================
+# OCR: détection des pages scannées, normalisation, concurrence bornée
+# ============================================================================
+
+# Nombre d'appels tesseract simultanés dans ce processus
+_tesseract_slots = threading.BoundedSemaphore(max(1, settings.OCR_MAX_CONCURRENCY))
+
+
+def has_text_layer(page) -> bool:
+    """Vrai si la page PDF contient du texte (sinon: page scannée)"""
+    return bool(page.chars)
+
+
+def raster_pixels(page) -> int:
+    """Nombre de pixels de la page rendue à la résolution OCR"""
+    return int(page.width * page.height * (settings.OCR_DPI / 72.0) ** 2)
+
+
+def rasterize_page(page) -> 'Image.Image':
+    """Rend une page PDF en image à la résolution OCR"""
+    image = page.to_image(resolution=settings.OCR_DPI).original
+    image.info['dpi'] = (settings.OCR_DPI, settings.OCR_DPI)
+    return image
+
+
+def prepare_image_for_ocr(image: 'Image.Image') -> 'Image.Image':
+    """
+    Normalise une image avant OCR:
+    orientation EXIF, niveaux de gris, résolution ramenée à OCR_DPI
+    (agrandissement limité à 2x) et réduction des photos trop grandes
+    (OCR_MAX_PIXELS)
+    """
+    from PIL import Image, ImageOps
+    
+    dpi = image.info.get('dpi')
+    
+    # Photo JPEG trop grande: décodage directement réduit (1/2, 1/4 ou 1/8)
+    # au lieu de décoder tous les pixels pour les réduire ensuite
+    width, height = image.size
+    if image.format == 'JPEG' and width * height > settings.OCR_MAX_PIXELS:
+        factor = (settings.OCR_MAX_PIXELS / float(width * height)) ** 0.5
+        image.draft('L', (int(width * factor), int(height * factor)))
+        if dpi and dpi[0] and image.size[0] != width:
+            reduction = image.size[0] / float(width)
+            dpi = (dpi[0] * reduction, dpi[1] * reduction)
+    
+    image = ImageOps.exif_transpose(image).convert('L')
+    width, height = image.size
+    
+    scale = 1.0
+    if dpi and dpi[0] and abs(dpi[0] - settings.OCR_DPI) > settings.OCR_DPI * 0.1:
+        scale = min(settings.OCR_DPI / float(dpi[0]), 2.0)
+    
+    # Plafond de pixels (photos de téléphone 6000x8000...)
+    if width * height * scale * scale > settings.OCR_MAX_PIXELS:
+        scale = (settings.OCR_MAX_PIXELS / float(width * height)) ** 0.5
+    
+    if abs(scale - 1.0) > 0.01:
+        image = image.resize(
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            Image.LANCZOS
+        )
+    return image
+
+
+def _seconds_left(deadline: Optional[float]) -> float:
+    """Secondes avant l'échéance (temps monotone), None = sans limite -> 0"""
+    if deadline is None:
+        return 0
+    return deadline - time.monotonic()
+
+
+def ocr_image(image: 'Image.Image', deadline: Optional[float] = None) -> str:
+    """
+    OCR tesseract, dans la limite de OCR_MAX_CONCURRENCY appels simultanés
+    
+    Args:
+        deadline: échéance (time.monotonic) au-delà de laquelle le processus
+            tesseract est arrêté (None = sans limite). Le temps restant est
+            calculé une fois le créneau obtenu: l'attente d'un créneau est
+            décomptée de l'échéance.
+    
+    Raises:
+        TimeoutError: échéance dépassée avant le démarrage de tesseract
+    """
+    import pytesseract
+    
+    with _tesseract_slots:
+        timeout = _seconds_left(deadline)
+        if deadline is not None and timeout <= 0:
+            raise TimeoutError("échéance dépassée avant l'OCR")
+        return pytesseract.image_to_string(image, lang=OCR_LANG, timeout=timeout)
+
+
+def ocr_images(images: List['Image.Image'], deadline: Optional[float] = None) -> List[List[str]]:
+    """
+    OCR de plusieurs pages en parallèle (tesseract tourne hors GIL)
+    
+    Toutes les pages partagent l'échéance: une page qui attend un créneau ne
+    démarre qu'avec le temps restant, et une page pas encore démarrée à
+    l'échéance est ignorée (liste vide).
+    """
+    def ocr_lines(image):
+        try:
+            if deadline is not None and _seconds_left(deadline) <= 0:
+                return []
+            return ocr_image(prepare_image_for_ocr(image), deadline=deadline).split('\n')
+        except Exception as e:
+            print(f"❌ Erreur OCR: {e}")
+            return []
+    
+    if len(images) == 1:
+        return [ocr_lines(images[0])]
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(len(images), settings.OCR_MAX_CONCURRENCY))) as executor:
+        return list(executor.map(ocr_lines, images))
+
+
+def _extract_page_worker(file_path: str, page_index: int) -> List[str]:
+    """Exécuté dans un processus du pool de pages: une seule page du PDF"""
+    import pdfplumber
+    
+    with pdfplumber.open(file_path) as pdf:
+        return extract_page_lines(pdf.pages[page_index])
+
+
+def _terminate_page_pool(pool: ProcessPoolExecutor):
+    """
+    Arrête le pool d'un document dont une page tourne encore après l'échéance
+    
+    pdfplumber ne peut pas être interrompu: sans cela, le processus resterait
+    occupé jusqu'à la fin de la page pathologique. Le pool n'appartient qu'à
+    ce document: aucune autre extraction n'est touchée.
+    """
+    # ProcessPoolExecutor n'expose pas de terminate(): arrêt des processus
+    # encore occupés, puis libération du pool sans attendre
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pages_parallel(file_path: Path, page_count: int, workers: int,
+                           deadline_seconds: float,
+                           budget: Optional[ProcessingBudget] = None) -> List[str]:
+    """
+    Extrait les pages en parallèle et fusionne les lignes dans l'ordre des pages
+    
+    Toutes les pages partagent une seule échéance: deadline_seconds pour
+    l'ensemble du document (PDF_PAGES_DEADLINE, bornée par l'échéance du
+    budget s'il y en a un). Les pages non terminées à l'échéance sont
+    ignorées.
+    
+    Chaque document a son propre pool (processus forkés, pdfplumber déjà
+    importé): si une page est encore en cours à l'échéance (graphismes
+    vectoriels énormes), ce pool est arrêté sans toucher aux PDF extraits en
+    même temps. Jusqu'à EXTRACTION_WORKERS x PDF_PAGE_WORKERS processus de
+    pages au total. Les pixels OCR des pages scannées ne sont pas décomptés
+    dans ce mode.
+    """
+    timeout = min(deadline_seconds, budget.remaining()) if budget is not None else deadline_seconds
+    pool = ProcessPoolExecutor(max_workers=max(1, min(workers, page_count)))
+    running = []
+    try:
+        futures = [pool.submit(_extract_page_worker, str(file_path), index)
+                   for index in range(page_count)]
+        
+        _, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            # Pages pas encore démarrées: annulées; pages en cours: pool arrêté
+            running = [future for future in not_done if not future.cancel()]
+            skipped = sorted(futures.index(future) + 1 for future in not_done)
+            print(f"⚠️ Pages {', '.join(map(str, skipped))} ignorées: échéance de {timeout:.1f}s dépassée")
+            if budget is not None:
+                budget.within_deadline()
+    finally:
+        if running:
+            _terminate_page_pool(pool)
+        else:
+            pool.shutdown(wait=True)
+    
+    lines = []
+    for index, future in enumerate(futures):
+        if future in not_done:
+            continue
+        try:
+            lines.extend(future.result())
+        except Exception as e:
+            print(f"⚠️ Page {index + 1} ignorée: {e}")
+    
+    return lines
+
+
+# ============================================================================
+# Cycle de vie: une instance partagée par worker
+# ============================================================================
+# Après __init__, l'extracteur n'a plus que de l'état en lecture seule
+# (patterns, tables, skills loader): une même instance peut servir
+# plusieurs requêtes en parallèle. Seule la construction est protégée.
+
+_extractor: Optional[CVExtractorV3] = None
+_extractor_lock = threading.Lock()
+
+# Durée de construction de l'extracteur (secondes), mesurée au démarrage
+extractor_init_seconds: Optional[float] = None
+
+
+def init_extractor() -> CVExtractorV3:
+    """Construit l'extracteur partagé (appelé au démarrage de l'application)"""
+    global _extractor, extractor_init_seconds
+    with _extractor_lock:
+        if _extractor is None:
+            start = time.perf_counter()
+            _extractor = CVExtractorV3()
+            extractor_init_seconds = time.perf_counter() - start
+    return _extractor
+
+
+def warmup() -> float:
+    """
+    Charge les dépendances lourdes et construit l'extracteur
+    
+    Appelé au démarrage (processus enfants du pool d'extraction) pour que
+    le premier CV ne paie pas ces imports. Retourne la durée en secondes.
+    """
+    start = time.perf_counter()
+    import pdfplumber
+    import pytesseract
+    from PIL import Image, ImageOps
+    from rapidfuzz import fuzz, process
+    init_extractor()
+    return time.perf_counter() - start
+
+
+def get_extractor() -> CVExtractorV3:
+    """
+    Dépendance FastAPI: retourne l'extracteur partagé
+    
+    Les tests peuvent le remplacer via app.dependency_overrides[get_extractor]
+    """
+    if _extractor is None:
+        return init_extractor()
+    return _extractor
 
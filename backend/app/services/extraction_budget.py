@@ -0,0 +1,70 @@
+"""
+Budget de traitement d'un CV
+
+Un PDF de 40 pages ou une photo de 6000x8000 ne doit pas occuper un
+processus d'extraction pendant des dizaines de secondes. Le budget borne
+le nombre de pages, de caractères analysés, de pixels passés à l'OCR et
+la durée totale; les étapes le consultent entre deux traitements et
+l'extracteur rend alors un résultat partiel marqué `truncated`.
+"""
+import time
+from typing import List, Optional
+
+# Raisons de troncature (champ `truncated_reasons` du résultat)
+TRUNCATED_PAGES = "pages"
+TRUNCATED_CHARS = "chars"
+TRUNCATED_PIXELS = "pixels"
+TRUNCATED_DEADLINE = "deadline"
+
+
+class ProcessingBudget:
+    """Limites d'une extraction et raisons de troncature rencontrées"""
+
+    def __init__(self, max_pages: int, max_chars: int, max_pixels: int, deadline_seconds: float):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_pixels = max_pixels
+        self.deadline = time.monotonic() + deadline_seconds
+        self.pixels_used = 0
+        self.truncated: List[str] = []
+
+    def truncate(self, reason: str):
+        if reason not in self.truncated:
+            self.truncated.append(reason)
+
+    def remaining(self) -> float:
+        """Secondes restantes avant l'échéance (0 si dépassée)"""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def within_deadline(self) -> bool:
+        """Faux (et troncature notée) si l'échéance est dépassée"""
+        if time.monotonic() < self.deadline:
+            return True
+        self.truncate(TRUNCATED_DEADLINE)
+        return False
+
+    def take_pixels(self, pixels: int) -> bool:
+        """Réserve des pixels pour l'OCR; faux (et troncature notée) si le budget est épuisé"""
+        if self.pixels_used + pixels > self.max_pixels:
+            self.truncate(TRUNCATED_PIXELS)
+            return False
+        self.pixels_used += pixels
+        return True
+
+
+def cap_lines(lines: List[str], max_chars: int) -> Optional[List[str]]:
+    """
+    Premières lignes dont le texte joint tient dans max_chars
+
+    Returns:
+        None si toutes les lignes tiennent
+    """
+    total = 0
+    for index, line in enumerate(lines):
+        if total + len(line) > max_chars:
+            # Ligne coupée plutôt que perdue (texte OCR sans retours à la ligne);
+            # le retour à la ligne qui la précède peut déjà remplir le plafond
+            head = line[:max(0, max_chars - total)]
+            return lines[:index] + ([head] if head else [])
+        total += len(line) + 1
+    return None
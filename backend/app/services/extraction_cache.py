@@ -0,0 +1,134 @@
+"""
+Cache des résultats d'extraction de CV, adressé par contenu
+
+Clé = SHA-256 du fichier + version du dataset de compétences + moteur fuzzy
++ version de l'extracteur. Un CV ré-uploadé à l'identique est servi sans
+nouvelle extraction; toute modification de resume_skills_complete_fr.json
+(rechargé à chaud ou non) ou de SKILLS_FUZZY_BACKEND change la clé et
+invalide le cache.
+
+Stockage: un fichier JSON par entrée dans EXTRACTION_CACHE_DIR, avec
+expiration (TTL) et éviction LRU (la date de modification sert de date
+de dernier accès). L'éviction parcourt tout le dossier: elle n'a lieu
+qu'un enregistrement sur `evict_interval` (le cache peut dépasser
+max_entries d'autant entre deux passages).
+
+Toutes les méthodes font des I/O disque bloquantes: depuis la boucle
+asyncio, les appeler via run_in_threadpool.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .cv_extractor_v3 import EXTRACTOR_VERSION
+from .skills_loader import get_dataset_version
+from ..config import settings
+
+
+class ExtractionCache:
+    """Cache disque LRU/TTL des résultats d'extraction"""
+
+    def __init__(self, cache_dir: str, max_entries: int, ttl_seconds: int,
+                 evict_interval: int = 1):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_interval = max(1, evict_interval)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(file_hash: str, dataset_version: Optional[str] = None,
+                 fuzzy_backend: Optional[str] = None) -> str:
+        """Clé de cache pour un fichier (par défaut: dataset sur disque et moteur configuré)"""
+        dataset_version = dataset_version or get_dataset_version()
+        fuzzy_backend = fuzzy_backend or settings.SKILLS_FUZZY_BACKEND
+        return f"{file_hash}_{dataset_version}_{fuzzy_backend}_v{EXTRACTOR_VERSION}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Résultat en cache ou None (entrée expirée supprimée)"""
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # Marque l'entrée comme récemment utilisée
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return result
+
+    def set(self, key: str, result: Dict):
+        """Enregistre un résultat (écriture atomique), éviction tous les evict_interval"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            # Premier enregistrement du processus: éviction (entrées d'un run précédent)
+            evict = self._writes % self.evict_interval == 0
+            self._writes += 1
+        if evict:
+            self._evict()
+
+    def _evict(self):
+        """Supprime les entrées expirées puis les moins récemment utilisées"""
+        with self._lock:
+            entries = []
+            now = time.time()
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                if now - mtime > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((mtime, path))
+
+            if len(entries) > self.max_entries:
+                entries.sort()
+                for _, path in entries[:len(entries) - self.max_entries]:
+                    path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Instance globale (None si le cache est désactivé)
+extraction_cache: Optional[ExtractionCache] = (
+    ExtractionCache(
+        cache_dir=settings.EXTRACTION_CACHE_DIR,
+        max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.EXTRACTION_CACHE_TTL,
+        evict_interval=settings.EXTRACTION_CACHE_EVICT_INTERVAL,
+    )
+    if settings.EXTRACTION_CACHE_ENABLED else None
+)
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Dépendance FastAPI: retourne le cache des extractions (ou None)
+
+    Les tests peuvent le remplacer via app.dependency_overrides[get_extraction_cache]
+    """
+    return extraction_cache
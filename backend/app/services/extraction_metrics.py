@@ -0,0 +1,98 @@
+"""
+Mesure des étapes de l'extraction de CV
+
+- StageTimer: durées par étape d'une extraction (ouverture PDF, OCR,
+  sections, compétences...), accumulées dans un dictionnaire
+- Histogram: histogrammes à buckets fixes, rendus au format texte
+  Prometheus par l'endpoint /metrics
+
+Les durées sont mesurées dans le processus qui extrait (enfant du pool)
+et renvoyées avec le résultat; le pool les enregistre dans les
+histogrammes du processus de l'API.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Bornes des buckets (secondes): de la regex (sub-ms) à l'OCR multi-pages
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Étape qui couvre toute l'extraction
+TOTAL_STAGE = "total"
+
+
+class StageTimer:
+    """Durées des étapes d'une extraction (une étape répétée est cumulée)"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+class Histogram:
+    """Histogramme Prometheus avec un label (thread-safe)"""
+
+    def __init__(self, name: str, documentation: str, label: str,
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        # Valeur du label -> (compteurs par bucket, +Inf compris), somme
+        self._series: Dict[str, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(label_value) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._series[label_value] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        """Lignes au format texte Prometheus (buckets cumulés)"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted((key, list(counts), total)
+                            for key, (counts, total) in self._series.items())
+        for label_value, counts, total in series:
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "smarthire_cv_extraction_stage_seconds",
+    "Duration of each CV extraction stage in seconds",
+    label="stage",
+)
+
+
+def record_timings(timings: Dict[str, float]):
+    """Enregistre les durées d'une extraction dans les histogrammes"""
+    for stage, seconds in timings.items():
+        stage_seconds.observe(stage, seconds)
+
+
+def render_metrics() -> str:
+    """Exposition texte Prometheus (endpoint /metrics)"""
+    return "\n".join(stage_seconds.render()) + "\n"
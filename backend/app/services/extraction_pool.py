@@ -0,0 +1,303 @@
+"""
+Pool de processus pour l'extraction de CV
+
+pdfplumber et tesseract sont CPU-bound et synchrones: exécutés dans la
+boucle asyncio, ils bloquent toutes les autres requêtes du worker uvicorn.
+Les extractions tournent donc dans un ProcessPoolExecutor dont chaque
+processus enfant garde un CVExtractorV3 préchauffé.
+
+- file d'attente bornée: au-delà de `max_pending` jobs, ExtractionPoolSaturated
+- délai maximal par job: ExtractionTimeout. Un processus ne peut pas être
+  interrompu en cours de job: un CV abandonné après le délai continue de
+  tourner jusqu'au bout, occupe son processus et sa place dans la file
+  (`abandoned` dans stats()); le délai protège la requête, pas le worker
+- processus enfant mort (mémoire, crash de tesseract): le pool est recréé,
+  le job en cours lève ExtractionPoolUnavailable (503), les suivants
+  repartent sur les nouveaux processus
+- `max_workers = 0`: extraction dans un thread du processus courant (dev/tests)
+- rechargement du référentiel: compteur partagé lu par les processus enfants
+- démarrage effectif d'un job: signalé par l'enfant sur une file partagée
+  (callback `on_start` de extract, ex: job d'ingestion passé à "running")
+- durées par étape renvoyées avec le résultat, enregistrées dans les
+  histogrammes de ce processus (endpoint /metrics)
+"""
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+from . import cv_extractor_v3, skills_loader
+from .extraction_metrics import record_timings
+from ..config import settings
+
+
+class ExtractionPoolSaturated(RuntimeError):
+    """Trop de jobs d'extraction en attente"""
+
+
+class ExtractionTimeout(TimeoutError):
+    """Le job d'extraction a dépassé son délai"""
+
+
+class ExtractionPoolUnavailable(RuntimeError):
+    """Le processus qui exécutait le job s'est arrêté (pool recréé)"""
+
+
+# ----------------------------------------------------------------------------
+# Fonctions exécutées dans les processus enfants
+# ----------------------------------------------------------------------------
+
+# Dans l'enfant: compteur de demandes de rechargement et dernière valeur traitée
+_reload_requests = None
+_reload_seen = 0
+# Dans l'enfant: file où annoncer le démarrage d'un job
+_started_jobs = None
+
+
+def _init_worker(reload_requests=None, started_jobs=None):
+    """Initializer du processus enfant: dépendances lourdes + extracteur, une fois"""
+    global _reload_requests, _reload_seen, _started_jobs
+    _reload_requests = reload_requests
+    _reload_seen = reload_requests.value if reload_requests is not None else 0
+    _started_jobs = started_jobs
+    cv_extractor_v3.warmup()
+
+
+def _warmup() -> float:
+    """Job vide qui force le démarrage d'un processus enfant"""
+    return cv_extractor_v3.extractor_init_seconds or 0.0
+
+
+def _extract_in_worker(file_path: str, job_id: Optional[int] = None) -> Dict:
+    """Extraction avec l'extracteur préchauffé du processus enfant"""
+    global _reload_seen
+    if job_id is not None and _started_jobs is not None:
+        _started_jobs.put(job_id)
+    if _reload_requests is not None and _reload_requests.value != _reload_seen:
+        # Nouvelle génération construite en arrière-plan: ce CV utilise encore
+        # l'ancienne, les suivants la nouvelle dès qu'elle est publiée
+        if skills_loader.reload_skills_loader():
+            _reload_seen = _reload_requests.value
+    return cv_extractor_v3.get_extractor().extract_from_file(file_path)
+
+
+def _extract_in_thread(file_path: str, loop: asyncio.AbstractEventLoop,
+                       on_start: Optional[Callable[[], None]]) -> Dict:
+    """Extraction dans un thread du processus courant (max_workers = 0)"""
+    if on_start is not None:
+        loop.call_soon_threadsafe(on_start)
+    return _extract_in_worker(file_path)
+
+
+class ExtractionPool:
+    """Exécute les extractions hors de la boucle asyncio, avec backpressure"""
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Jobs soumis et non terminés (y compris ceux abandonnés après timeout)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+        # Demandes de rechargement du référentiel, partagées avec les enfants
+        self._reload_requests = multiprocessing.Value('i', 0)
+        # Démarrages annoncés par les enfants -> callbacks on_start en attente
+        self._started_jobs = None
+        self._start_callbacks: Dict[int, Tuple[asyncio.AbstractEventLoop, Callable[[], None]]] = {}
+        self._job_ids = itertools.count(1)
+        # Jobs abandonnés après le délai mais encore en cours, pools recréés
+        self._abandoned = 0
+        self.restarts = 0
+
+    @property
+    def saturated(self) -> bool:
+        return self._pending >= self.max_pending
+
+    def start(self):
+        """Démarre et préchauffe les processus (appelé au startup de l'app)"""
+        start = time.perf_counter()
+        if self.max_workers > 0:
+            self._started_jobs = multiprocessing.SimpleQueue()
+            threading.Thread(
+                target=self._listen_started_jobs, args=(self._started_jobs,),
+                name="extraction-started", daemon=True
+            ).start()
+            self._executor = self._new_executor()
+            warmups = [self._executor.submit(_warmup) for _ in range(self.max_workers)]
+            for future in warmups:
+                future.result()
+        else:
+            cv_extractor_v3.warmup()
+        self.init_seconds = time.perf_counter() - start
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self._reload_requests, self._started_jobs),
+        )
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor):
+        """Recrée le pool après la mort d'un processus (une seule fois par pool cassé)"""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            # Les processus démarrent au premier job (warmup dans l'initializer)
+            self._executor = self._new_executor()
+            self.restarts += 1
+        print(f"⚠️  Processus d'extraction arrêté: pool recréé ({self.restarts} redémarrage(s))")
+
+    def shutdown(self):
+        """Arrête les processus enfants (appelé au shutdown de l'app)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._started_jobs is not None:
+            self._started_jobs.put(None)
+            self._started_jobs = None
+
+    def _listen_started_jobs(self, started_jobs):
+        """Thread du parent: déclenche on_start quand un enfant commence un job"""
+        while True:
+            job_id = started_jobs.get()
+            if job_id is None:
+                return
+            callback = self._start_callbacks.pop(job_id, None)
+            if callback is not None:
+                # Exécuté dans la boucle, avant le résultat du même job
+                loop, on_start = callback
+                loop.call_soon_threadsafe(on_start)
+
+    def reload_skills(self) -> int:
+        """
+        Demande le rechargement du référentiel de compétences
+        
+        Chaque processus enfant le reconstruit en arrière-plan avant sa
+        prochaine extraction; sans processus (max_workers = 0), le
+        rechargement a lieu dans le processus courant.
+        
+        Returns:
+            Numéro de la demande
+        """
+        with self._reload_requests.get_lock():
+            self._reload_requests.value += 1
+            request = self._reload_requests.value
+        if self._executor is None:
+            skills_loader.reload_skills_loader()
+        return request
+    
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _abandon(self, future):
+        """Job parti au-delà du délai: compté jusqu'à sa vraie fin"""
+        with self._lock:
+            self._abandoned += 1
+
+        def finished(_future):
+            with self._lock:
+                self._abandoned -= 1
+
+        future.add_done_callback(finished)
+
+    async def extract(self, file_path: str,
+                      on_start: Optional[Callable[[], None]] = None) -> Dict:
+        """
+        Extrait un CV sans bloquer la boucle asyncio
+
+        Args:
+            on_start: appelé (dans la boucle) quand un processus commence
+                réellement le job, après son attente dans la file
+
+        Raises:
+            ExtractionPoolSaturated: file d'attente pleine
+            ExtractionTimeout: délai dépassé (le job continue dans son processus)
+            ExtractionPoolUnavailable: le processus du job s'est arrêté
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExtractionPoolSaturated(
+                    f"{self._pending} extractions en attente (max {self.max_pending})"
+                )
+            self._pending += 1
+
+        loop = asyncio.get_running_loop()
+        job_id = next(self._job_ids)
+        executor = self._executor
+        if executor is not None:
+            if on_start is not None:
+                self._start_callbacks[job_id] = (loop, on_start)
+            try:
+                try:
+                    future = executor.submit(_extract_in_worker, file_path, job_id)
+                except BrokenProcessPool:
+                    # Pool cassé par un job précédent: celui-ci n'a pas tourné, on le resoumet
+                    self._replace_broken_executor(executor)
+                    executor = self._executor
+                    future = executor.submit(_extract_in_worker, file_path, job_id)
+            except BaseException:
+                self._start_callbacks.pop(job_id, None)
+                self._release()
+                raise
+            # Le compteur n'est libéré que lorsque le processus a vraiment fini
+            future.add_done_callback(self._release)
+            awaitable = asyncio.wrap_future(future)
+        else:
+            future = None
+            awaitable = loop.run_in_executor(None, _extract_in_thread, file_path, loop, on_start)
+            awaitable.add_done_callback(self._release)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(awaitable), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # Retire le job s'il n'a pas encore démarré; sinon il va au bout
+            if future is None or not future.cancel():
+                self._abandon(future or awaitable)
+            raise ExtractionTimeout(f"Extraction interrompue après {self.timeout}s")
+        except BrokenProcessPool:
+            self._replace_broken_executor(executor)
+            raise ExtractionPoolUnavailable("Le processus d'extraction s'est arrêté pendant le job")
+        finally:
+            self._start_callbacks.pop(job_id, None)
+        
+        record_timings(result.get("timings") or {})
+        return result
+
+    def stats(self) -> Dict:
+        """État du pool (exposé par /health)"""
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "abandoned": self._abandoned,
+            "restarts": self.restarts,
+            "max_pending": self.max_pending,
+            "timeout": self.timeout,
+            "init_seconds": self.init_seconds,
+            "skills_reload_requests": self._reload_requests.value,
+        }
+
+
+# Instance globale (démarrée par l'événement startup)
+extraction_pool = ExtractionPool(
+    max_workers=settings.EXTRACTION_WORKERS,
+    max_pending=settings.EXTRACTION_MAX_PENDING,
+    timeout=settings.EXTRACTION_TIMEOUT,
+)
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """
+    Dépendance FastAPI: retourne le pool d'extraction
+
+    Les tests peuvent le remplacer via app.dependency_overrides[get_extraction_pool]
+    """
+    return extraction_pool
@@ -0,0 +1,163 @@
+"""
+Stockage des jobs d'ingestion asynchrone de CV
+
+Deux implémentations interchangeables:
+- InMemoryJobStore: dictionnaire protégé par un verrou (un seul worker, tests);
+  les jobs terminés sont évincés après CV_JOB_TTL secondes ou au-delà de
+  CV_JOB_MAX_FINISHED jobs
+- DatabaseJobStore: table cv_ingestion_jobs (partagée entre workers uvicorn)
+"""
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.cv_job import CVIngestionJob
+
+JOB_FIELDS = ("id", "user_id", "status", "nom_fichier", "cv_id",
+              "result", "error", "created_at", "updated_at")
+
+# Statuts définitifs (le job n'évolue plus)
+FINISHED_STATUSES = ("done", "failed")
+
+
+class JobStore(ABC):
+    """Interface commune des stores de jobs"""
+
+    @abstractmethod
+    def create(self, user_id: int, nom_fichier: str) -> Dict:
+        """Crée un job 'queued' et le retourne"""
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Retourne le job ou None"""
+        pass
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        """Met à jour les champs d'un job (status, cv_id, result, error)"""
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """Jobs gardés en mémoire du processus"""
+
+    def __init__(self, ttl: Optional[float] = None, max_finished: Optional[int] = None):
+        self.ttl = settings.CV_JOB_TTL if ttl is None else ttl
+        self.max_finished = settings.CV_JOB_MAX_FINISHED if max_finished is None else max_finished
+        self._jobs: Dict[str, Dict] = {}
+        # Jobs terminés -> instant de fin, du plus ancien au plus récent
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, user_id: int, nom_fichier: str) -> Dict:
+        now = datetime.utcnow()
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": "queued",
+            "nom_fichier": nom_fichier,
+            "cv_id": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job["id"]] = job
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields, updated_at=datetime.utcnow())
+                if job["status"] in FINISHED_STATUSES and job_id not in self._finished:
+                    self._finished[job_id] = time.monotonic()
+                    self._evict_finished()
+
+    def _evict_finished(self):
+        """Oublie les jobs terminés expirés ou en surnombre (verrou tenu)"""
+        expired = time.monotonic() - self.ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > expired and len(self._finished) <= self.max_finished:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+
+class DatabaseJobStore(JobStore):
+    """Jobs persistés dans la table cv_ingestion_jobs"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_dict(job: CVIngestionJob) -> Dict:
+        return {field: getattr(job, field) for field in JOB_FIELDS}
+
+    def create(self, user_id: int, nom_fichier: str) -> Dict:
+        db = self.session_factory()
+        try:
+            job = CVIngestionJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status="queued",
+                nom_fichier=nom_fichier,
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return self._to_dict(job)
+        finally:
+            db.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = db.query(CVIngestionJob).filter(CVIngestionJob.id == job_id).first()
+            return self._to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def update(self, job_id: str, **fields) -> None:
+        db = self.session_factory()
+        try:
+            db.query(CVIngestionJob).filter(CVIngestionJob.id == job_id).update(fields)
+            db.commit()
+        finally:
+            db.close()
+
+
+JOB_STORES = {
+    "memory": InMemoryJobStore,
+    "database": DatabaseJobStore,
+}
+
+if settings.CV_JOB_STORE not in JOB_STORES:
+    raise ValueError(f"Unknown CV_JOB_STORE: {settings.CV_JOB_STORE}")
+
+# Instance globale
+job_store: JobStore = JOB_STORES[settings.CV_JOB_STORE]()
+
+
+def get_job_store() -> JobStore:
+    """
+    Dépendance FastAPI: retourne le store de jobs
+
+    Les tests peuvent le remplacer via app.dependency_overrides[get_job_store]
+    """
+    return job_store
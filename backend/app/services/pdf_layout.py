@@ -0,0 +1,210 @@
+"""
+Reconstruction de la mise en page d'une page PDF
+
+Transforme les mots positionnés de pdfplumber (x0, x1, top, text) en
+lignes dans l'ordre de lecture, en tenant compte des CV en colonnes:
+
+1. Gouttières: histogramme de couverture horizontale des mots, les bandes
+   verticales (quasi) vides entre deux blocs de texte séparent les colonnes
+2. Lignes: regroupement des mots par position verticale avec tolérance
+   (au lieu de l'arrondi exact de `top`)
+3. Ordre de lecture: entre deux lignes pleine largeur (titre, bannière),
+   chaque colonne est émise entière; celles qui démarrent en haut du bloc
+   d'abord, puis de gauche à droite
+
+Coût: O(n log n) sur le nombre de mots.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+# Deux mots sont sur la même ligne si leurs `top` diffèrent de moins de ça (pt)
+LINE_Y_TOLERANCE = 3.0
+
+# Résolution de l'histogramme horizontal (pt) et nombre maximal de cases
+HISTOGRAM_BIN = 2.0
+HISTOGRAM_MAX_BINS = 2000
+
+# Largeur minimale d'une gouttière entre deux colonnes (pt)
+MIN_GUTTER_WIDTH = 12.0
+
+# Part maximale des lignes qui peuvent traverser une gouttière (titres)
+GUTTER_MAX_COVERAGE = 0.1
+
+# Une colonne doit contenir au moins cette part des mots et de la largeur
+MIN_COLUMN_WORDS = 0.08
+MIN_COLUMN_WIDTH = 0.2
+
+
+def group_rows(words: Sequence[Dict], tolerance: float = LINE_Y_TOLERANCE) -> List[List[Dict]]:
+    """
+    Regroupe les mots en lignes de haut en bas
+
+    Un mot rejoint la ligne courante si son `top` est à moins de `tolerance`
+    du premier mot de la ligne (ancre fixe: pas d'effet de chaîne).
+    """
+    rows: List[List[Dict]] = []
+    anchor = None
+    for word in sorted(words, key=lambda w: w['top']):
+        if anchor is None or word['top'] - anchor > tolerance:
+            rows.append([])
+            anchor = word['top']
+        rows[-1].append(word)
+    return rows
+
+
+def _gutter_core(coverage: List[int], start: int, end: int) -> Tuple[int, int]:
+    """
+    Plus longue sous-bande à couverture minimale dans [start, end)
+
+    Évite d'inclure dans la gouttière le bord irrégulier d'une colonne
+    (quelques mots plus longs que les autres).
+    """
+    lowest = min(coverage[start:end])
+    best = (start, start)
+    run_start = None
+    for i in range(start, end + 1):
+        if i < end and coverage[i] == lowest:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start > best[1] - best[0]:
+                best = (run_start, i)
+            run_start = None
+    return best
+
+
+def detect_gutters(words: Sequence[Dict], row_count: int) -> List[Tuple[float, float]]:
+    """
+    Détecte les gouttières verticales entre colonnes
+
+    Returns:
+        Intervalles (x_début, x_fin) triés de gauche à droite
+    """
+    if not words or row_count < 2:
+        return []
+
+    left = min(w['x0'] for w in words)
+    right = max(w['x1'] for w in words)
+    span = right - left
+    if span <= 0:
+        return []
+
+    bin_width = max(HISTOGRAM_BIN, span / HISTOGRAM_MAX_BINS)
+    bins = int(span / bin_width) + 1
+
+    # Tableau de différences: +1 au début du mot, -1 après sa fin
+    delta = [0] * (bins + 1)
+    for word in words:
+        delta[int((word['x0'] - left) / bin_width)] += 1
+        delta[int((word['x1'] - left) / bin_width) + 1] -= 1
+
+    coverage = []
+    running = 0
+    for i in range(bins):
+        running += delta[i]
+        coverage.append(running)
+
+    max_coverage = max(1, int(row_count * GUTTER_MAX_COVERAGE))
+    min_bins = int(MIN_GUTTER_WIDTH / bin_width)
+
+    # Bandes de cases peu couvertes (jamais au bord: les mots extrêmes couvrent)
+    candidates = []
+    run_start = None
+    for i in range(bins + 1):
+        if i < bins and coverage[i] <= max_coverage:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            core = _gutter_core(coverage, run_start, i)
+            if core[1] - core[0] >= min_bins:
+                candidates.append((left + core[0] * bin_width, left + core[1] * bin_width))
+            run_start = None
+
+    if not candidates:
+        return []
+
+    # Validation: chaque colonne doit être significative (mots et largeur)
+    centers = sorted((w['x0'] + w['x1']) / 2 for w in words)
+    min_words = len(words) * MIN_COLUMN_WORDS
+    min_width = span * MIN_COLUMN_WIDTH
+
+    def column_ok(start: float, end: float) -> bool:
+        count = bisect_left(centers, end) - bisect_right(centers, start)
+        return count >= min_words and end - start >= min_width
+
+    accepted: List[Tuple[float, float]] = []
+    # Les gouttières les plus larges d'abord
+    for gutter in sorted(candidates, key=lambda g: g[1] - g[0], reverse=True):
+        bounds = sorted(accepted + [gutter])
+        index = bounds.index(gutter)
+        start = bounds[index - 1][1] if index > 0 else left
+        end = bounds[index + 1][0] if index + 1 < len(bounds) else right
+        if column_ok(start, gutter[0]) and column_ok(gutter[1], end):
+            accepted = bounds
+
+    return accepted
+
+
+def _line_text(words: Sequence[Dict]) -> str:
+    return ' '.join(w['text'] for w in sorted(words, key=lambda w: w['x0']))
+
+
+def words_to_lines(words: Sequence[Dict]) -> List[str]:
+    """
+    Lignes de la page dans l'ordre de lecture
+
+    Les blocs de colonnes sont séparés par une ligne vide pour que le
+    regroupement des lignes logiques ne fusionne pas deux colonnes.
+    """
+    rows = group_rows(words)
+    gutters = detect_gutters(words, len(rows))
+    if not gutters:
+        return [_line_text(row) for row in rows]
+
+    gutter_starts = [g[0] for g in gutters]
+    lines: List[str] = []
+    columns: List[List[str]] = [[] for _ in range(len(gutters) + 1)]
+
+    # Position verticale de la première ligne de chaque colonne du bloc
+    column_tops: List[float] = [0.0] * len(columns)
+
+    def flush() -> bool:
+        # Colonnes qui démarrent en haut du bloc d'abord (ex: nom au-dessus
+        # de la colonne principale, barre latérale qui commence plus bas)
+        started = [i for i, column in enumerate(columns) if column]
+        if not started:
+            return False
+        block_top = min(column_tops[i] for i in started)
+        order = sorted(started, key=lambda i: (column_tops[i] - block_top > LINE_Y_TOLERANCE, i))
+        for i in order:
+            if lines and lines[-1]:
+                lines.append('')
+            lines.extend(columns[i])
+            columns[i].clear()
+        return True
+
+    for row in rows:
+        segments: List[List[Dict]] = [[] for _ in columns]
+        spanning = False
+        for word in row:
+            column = bisect_left(gutter_starts, word['x1'])
+            # Mot à cheval sur une gouttière: ligne pleine largeur
+            if column > 0 and word['x0'] < gutters[column - 1][1]:
+                spanning = True
+                break
+            segments[column].append(word)
+
+        if spanning:
+            if flush():
+                lines.append('')
+            lines.append(_line_text(row))
+            continue
+
+        for i, segment in enumerate(segments):
+            if segment:
+                if not columns[i]:
+                    column_tops[i] = segment[0]['top']
+                columns[i].append(_line_text(segment))
+
+    flush()
+    return lines
@@ -0,0 +1,105 @@
+"""
+Classification des titres de sections de CV
+
+Construit une seule fois à partir des patterns de sections de l'extracteur,
+puis utilisé pour chaque ligne (découpage en sections, heuristique du nom).
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Score minimal (exclusif) du fuzzy matching, comme l'ancienne boucle
+SECTION_FUZZY_THRESHOLD = 85
+
+# Au-delà, la ligne est du texte courant et jamais un titre, même si elle
+# contient un mot-clé ("passionate about...", "communication skills...")
+SECTION_HEADING_MAX_CHARS = 60
+SECTION_HEADING_MAX_WORDS = 6
+
+# Le fallback fuzzy n'est tenté que sur les lignes courtes (titres probables)
+SECTION_FUZZY_MAX_CHARS = 40
+
+# En dessous, partial_ratio matche n'importe quel fragment de mot-clé
+SECTION_FUZZY_MIN_CHARS = 4
+
+_NON_WORD = re.compile(r'[^\w\s]|\d')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_heading(text: str) -> str:
+    """Minuscules, sans accents, symboles ni chiffres, espaces simples"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _SPACES.sub(' ', _NON_WORD.sub(' ', text)).strip()
+
+
+class SectionClassifier:
+    """
+    Associe une ligne à un type de section ('experience', 'formation', ...)
+
+    0. Les lignes longues (plus de SECTION_HEADING_MAX_CHARS caractères ou
+       SECTION_HEADING_MAX_WORDS mots une fois normalisées) ne sont jamais
+       des titres.
+    1. Recherche exacte: chaque groupe de 1 à N mots consécutifs de la ligne
+       normalisée est cherché dans un dictionnaire mot-clé -> section.
+    2. Fallback fuzzy borné: pour les lignes courtes uniquement, un seul
+       `process.extractOne` sur la liste (fixe) des mots-clés.
+
+    Le coût dépend de la longueur de la ligne et non plus du produit
+    lignes × mots-clés. À égalité, la section déclarée en premier l'emporte.
+    """
+
+    def __init__(self, section_patterns: Dict[str, List[str]]):
+        # Mot-clé normalisé -> (priorité, section)
+        self.lookup: Dict[str, tuple] = {}
+        self.keywords: List[str] = []
+        self.keyword_sections: List[str] = []
+
+        for priority, (section, keywords) in enumerate(section_patterns.items()):
+            for keyword in keywords:
+                normalized = normalize_heading(keyword)
+                if not normalized or normalized in self.lookup:
+                    continue
+                self.lookup[normalized] = (priority, section)
+                self.keywords.append(normalized)
+                self.keyword_sections.append(section)
+
+        self.max_words = max((len(k.split()) for k in self.keywords), default=1)
+
+    def _exact(self, normalized: str) -> Optional[str]:
+        words = normalized.split()
+        best = None
+        for size in range(1, self.max_words + 1):
+            for start in range(len(words) - size + 1):
+                hit = self.lookup.get(' '.join(words[start:start + size]))
+                if hit and (best is None or hit[0] < best[0]):
+                    best = hit
+                    if best[0] == 0:
+                        return best[1]
+        return best[1] if best else None
+
+    def classify(self, line: str) -> Optional[str]:
+        """Retourne le type de section si la ligne est un titre, sinon None"""
+        normalized = normalize_heading(line)
+        if not normalized:
+            return None
+        if (len(normalized) > SECTION_HEADING_MAX_CHARS
+                or normalized.count(' ') >= SECTION_HEADING_MAX_WORDS):
+            return None
+
+        section = self._exact(normalized)
+        if section:
+            return section
+
+        if SECTION_FUZZY_MIN_CHARS <= len(normalized) <= SECTION_FUZZY_MAX_CHARS:
+            from rapidfuzz import fuzz, process
+
+            match = process.extractOne(
+                normalized, self.keywords,
+                scorer=fuzz.partial_ratio,
+                score_cutoff=SECTION_FUZZY_THRESHOLD,
+            )
+            if match and match[1] > SECTION_FUZZY_THRESHOLD:
+                return self.keyword_sections[match[2]]
+
+        return None
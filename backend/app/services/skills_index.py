@@ -0,0 +1,243 @@
+"""
+Index binaire compilé du référentiel de compétences
+
+Le JSON (resume_skills_complete_fr.json) reste la source de vérité.
+`python build_skills_index.py` le compile dans un fichier voisin (.skidx)
+fait de tableaux plats (entiers little-endian, chaînes UTF-8) lisibles
+directement après mmap:
+
+- compétences (ordre de l'index de trigrammes) et bits de catégorie
+- tables de l'automate Aho-Corasick (transitions, liens d'échec, sorties)
+- postings de l'index de trigrammes
+
+Les processus mappent le fichier en lecture seule. Seuls les postings et
+les compteurs de l'index de trigrammes restent des vues sur le fichier,
+partagées via le cache du système. Les tables de l'automate sont recopiées
+en listes et dicts Python à chaque chargement (~10 Mo et ~30 ms par
+processus): la recherche exacte lit une transition par caractère, deux fois
+plus lente sur une vue mémoire. L'index évite donc le parsing du JSON et la
+construction de l'automate, pas sa copie par worker.
+
+L'en-tête porte la version du format et l'empreinte du JSON source: un
+index périmé est ignoré (et reconstruit par le loader).
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .skills_matcher import SkillAutomaton, SkillNgramIndex
+
+INDEX_SUFFIX = '.skidx'
+INDEX_MAGIC = b'SKIDX\x00\x00\x00'
+# À incrémenter à chaque changement de la disposition du fichier
+INDEX_FORMAT_VERSION = 2
+
+# En-tête: magic, version du format, empreinte du JSON source, nombre de sections
+_HEADER = struct.Struct('<8sI16sI')
+# Table des sections: nom, offset, taille (octets)
+_SECTION = struct.Struct('<16sQQ')
+_ALIGN = 8
+_SEPARATOR = '\x00'
+
+CATEGORY_BITS = {'technical': 1, 'soft': 2}
+_CATEGORY_NAMES = {bit: name for name, bit in CATEGORY_BITS.items()}
+
+
+def index_path_for(json_path: Path) -> Path:
+    """Chemin de l'index compilé d'un dataset JSON"""
+    return json_path.with_suffix(INDEX_SUFFIX)
+
+
+class SkillsIndex:
+    """Index chargé depuis le fichier mappé"""
+
+    def __init__(self, source_hash: str, technical_skills: Set[str], soft_skills: Set[str],
+                 automaton: SkillAutomaton, ngram_index: SkillNgramIndex, buffer: mmap.mmap):
+        self.source_hash = source_hash
+        self.technical_skills = technical_skills
+        self.soft_skills = soft_skills
+        self.automaton = automaton
+        self.ngram_index = ngram_index
+        # Gardé ouvert: les postings et compteurs sont des vues sur le fichier
+        self.buffer = buffer
+
+
+# ----------------------------------------------------------------------------
+# Écriture
+# ----------------------------------------------------------------------------
+
+def _ints(values: Iterable[int], typecode: str = 'i') -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _strings(values: Iterable[str]) -> bytes:
+    return _SEPARATOR.join(values).encode('utf-8')
+
+
+def _offsets(lengths: Iterable[int]) -> List[int]:
+    """[0, l0, l0+l1, ...]: début de chaque groupe dans un tableau plat"""
+    offsets = [0]
+    for length in lengths:
+        offsets.append(offsets[-1] + length)
+    return offsets
+
+
+def write_index(index_path: Path, source_hash: str, technical_skills: Set[str],
+                soft_skills: Set[str], automaton: SkillAutomaton,
+                ngram_index: SkillNgramIndex) -> Path:
+    """Sérialise des structures déjà construites (écriture atomique)"""
+    skills = ngram_index.skills
+    skill_ids = {skill: skill_id for skill_id, skill in enumerate(skills)}
+
+    categories = bytearray(len(skills))
+    for category, members in (('technical', technical_skills), ('soft', soft_skills)):
+        for skill in members:
+            categories[skill_ids[skill]] |= CATEGORY_BITS[category]
+
+    goto, fail, out = automaton.tables()
+    pairs = automaton.skills
+    out_states = [state for state, outputs in enumerate(out) if outputs]
+    postings, ngram_counts = ngram_index.tables()
+    ngrams = sorted(postings)
+
+    sections = {
+        'skills': _strings(skills),
+        'categories': bytes(categories),
+        'ac_patterns': _strings(automaton.patterns),
+        'ac_pair_start': _ints(_offsets(len(p) for p in pairs)),
+        'ac_pair_skill': _ints(skill_ids[skill] for p in pairs for _, skill in p),
+        'ac_pair_cat': bytes(CATEGORY_BITS[category] for p in pairs for category, _ in p),
+        'ac_goto_start': _ints(_offsets(len(edges) for edges in goto)),
+        'ac_goto_chars': ''.join(char for edges in goto for char in edges).encode('utf-8'),
+        'ac_goto_next': _ints(next_state for edges in goto for next_state in edges.values()),
+        'ac_fail': _ints(fail),
+        'ac_out_state': _ints(out_states),
+        'ac_out_start': _ints(_offsets(len(out[state]) for state in out_states)),
+        'ac_out': _ints(pattern_id for state in out_states for pattern_id in out[state]),
+        'ng_keys': _strings(ngrams),
+        'ng_post_start': _ints(_offsets(len(postings[ngram]) for ngram in ngrams)),
+        'ng_post': _ints(skill_id for ngram in ngrams for skill_id in postings[ngram]),
+        'ng_counts': _ints(ngram_counts),
+    }
+
+    header = _HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION,
+                          source_hash.encode('ascii'), len(sections))
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    body = []
+    for name, data in sections.items():
+        padding = -offset % _ALIGN
+        body.append(b'\x00' * padding)
+        offset += padding
+        table.append(_SECTION.pack(name.encode('ascii'), offset, len(data)))
+        body.append(data)
+        offset += len(data)
+
+    # Écriture atomique: un worker ne mappe jamais un fichier à moitié écrit
+    tmp_path = index_path.with_suffix(f'{INDEX_SUFFIX}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.writelines(table)
+        f.writelines(body)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+# ----------------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------------
+
+def read_source_hash(index_path: Path) -> Optional[str]:
+    """Empreinte du JSON source enregistrée dans l'index (None si illisible)"""
+    try:
+        with open(index_path, 'rb') as f:
+            magic, version, source_hash, _ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+        return None
+    return source_hash.decode('ascii')
+
+
+def load_index(index_path: Path, source_hash: str) -> Optional[SkillsIndex]:
+    """
+    Mappe l'index en lecture seule
+
+    Returns:
+        None si le fichier est absent, d'un autre format ou périmé
+        (empreinte différente de celle du JSON source)
+    """
+    if sys.byteorder != 'little' or read_source_hash(index_path) != source_hash:
+        return None
+
+    with open(index_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    section_count = _HEADER.unpack_from(buffer, 0)[3]
+    sections = {}
+    for i in range(section_count):
+        name, offset, size = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+        sections[name.rstrip(b'\x00').decode('ascii')] = view[offset:offset + size]
+
+    def ints(name: str, typecode: str = 'i') -> memoryview:
+        return sections[name].cast(typecode)
+
+    def strings(name: str) -> List[str]:
+        data = bytes(sections[name])
+        return data.decode('utf-8').split(_SEPARATOR) if data else []
+
+    skills = strings('skills')
+    categories = sections['categories']
+    technical_skills = {skill for skill, bits in zip(skills, categories) if bits & CATEGORY_BITS['technical']}
+    soft_skills = {skill for skill, bits in zip(skills, categories) if bits & CATEGORY_BITS['soft']}
+
+    # Automate: tables recopiées sous la forme de SkillAutomaton (un dict de
+    # transitions par état, listes Python), donc privées à chaque processus:
+    # la recherche est une boucle Python, l'accès à une vue mémoire y
+    # coûterait à chaque caractère
+    pair_start = ints('ac_pair_start').tolist()
+    pair_skill = ints('ac_pair_skill').tolist()
+    pair_cat = sections['ac_pair_cat'].tolist()
+    pairs = [
+        [(_CATEGORY_NAMES[pair_cat[i]], skills[pair_skill[i]])
+         for i in range(pair_start[p], pair_start[p + 1])]
+        for p in range(len(pair_start) - 1)
+    ]
+
+    goto_start = ints('ac_goto_start').tolist()
+    goto_chars = bytes(sections['ac_goto_chars']).decode('utf-8')
+    goto_next = ints('ac_goto_next').tolist()
+    goto = [
+        dict(zip(goto_chars[goto_start[state]:goto_start[state + 1]],
+                 goto_next[goto_start[state]:goto_start[state + 1]]))
+        for state in range(len(goto_start) - 1)
+    ]
+
+    out: List[Tuple[int, ...]] = [()] * len(goto)
+    out_start = ints('ac_out_start').tolist()
+    out_ids = ints('ac_out').tolist()
+    for k, state in enumerate(ints('ac_out_state').tolist()):
+        out[state] = tuple(out_ids[out_start[k]:out_start[k + 1]])
+
+    automaton = SkillAutomaton.from_tables(
+        strings('ac_patterns'), pairs, goto, ints('ac_fail').tolist(), out
+    )
+
+    # Index de trigrammes: postings et compteurs lus directement dans le fichier
+    post_start = ints('ng_post_start').tolist()
+    post = ints('ng_post')
+    postings = {
+        ngram: post[post_start[k]:post_start[k + 1]]
+        for k, ngram in enumerate(strings('ng_keys'))
+    }
+    ngram_index = SkillNgramIndex.from_tables(skills, postings, ints('ng_counts'))
+
+    return SkillsIndex(source_hash, technical_skills, soft_skills, automaton, ngram_index, buffer)
@@ -3,10 +3,99 @@ Module pour charger et interroger le référentiel de compétences
 Dataset: 2795 compétences de 9544 CV réels (tous secteurs)
 """
 import json
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Set, Optional
-from rapidfuzz import fuzz, process
-import re
+from typing import List, Dict, Set, Optional, Tuple, Iterable, Iterator
+
+from .skills_matcher import (
+    SkillAutomaton, SkillNgramIndex, FUZZY_BACKENDS, FUZZY_BACKEND_NAMES,
+    fuzzy_match_cdist_batch
+)
+from .skills_index import index_path_for, load_index, write_index
+from ..config import settings
+
+
+# Datasets disponibles (par ordre de priorité)
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+RESUME_COMPLETE_FR = DATA_DIR / "resume_skills_complete_fr.json"
+RESUME_COMPLETE = DATA_DIR / "resume_skills_complete.json"
+
+# Version de la liste par défaut (aucun dataset trouvé)
+DEFAULT_DATASET_VERSION = "default"
+
+# Nombre de textes traités ensemble par search_skills_batch (une tâche du pool)
+BATCH_CHUNK_SIZE = 32
+
+
+def _hash_dataset(content: bytes) -> str:
+    """Version d'un dataset: empreinte SHA-256 (tronquée) de son contenu"""
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def find_dataset_path() -> Optional[Path]:
+    """Dataset qui serait chargé au prochain démarrage (FR en priorité)"""
+    for path in (RESUME_COMPLETE_FR, RESUME_COMPLETE):
+        if path.exists():
+            return path
+    return None
+
+
+# (chemin, mtime, taille) -> version, pour ne re-hasher que si le fichier change
+_version_cache: Dict[Tuple[str, float, int], str] = {}
+
+def get_dataset_version() -> str:
+    """
+    Version du dataset actuellement sur disque
+    
+    Change dès que resume_skills_complete_fr.json est modifié: les caches
+    indexés sur cette version sont invalidés automatiquement.
+    """
+    path = find_dataset_path()
+    if path is None:
+        return DEFAULT_DATASET_VERSION
+    stat = path.stat()
+    key = (str(path), stat.st_mtime, stat.st_size)
+    version = _version_cache.get(key)
+    if version is None:
+        version = _hash_dataset(path.read_bytes())
+        _version_cache.clear()
+        _version_cache[key] = version
+    return version
+
+
+def build_matchers(technical_skills: Set[str],
+                   soft_skills: Set[str]) -> Tuple[SkillAutomaton, SkillNgramIndex]:
+    """Compile l'automate exact et l'index de trigrammes d'un dataset"""
+    automaton = SkillAutomaton({
+        'technical': technical_skills,
+        'soft': soft_skills,
+    })
+    return automaton, SkillNgramIndex(technical_skills | soft_skills)
+
+
+def build_skills_index(json_path: Optional[Path] = None) -> Path:
+    """
+    Étape de build: compile le dataset JSON en index binaire (.skidx)
+    
+    Returns:
+        Chemin de l'index écrit à côté du JSON
+    """
+    json_path = json_path or find_dataset_path()
+    if json_path is None:
+        raise FileNotFoundError("Aucun dataset de compétences trouvé")
+    content = json_path.read_bytes()
+    data = json.loads(content.decode('utf-8'))
+    technical_skills = set(data.get('technical_skills', []))
+    soft_skills = set(data.get('soft_skills', []))
+    automaton, ngram_index = build_matchers(technical_skills, soft_skills)
+    return write_index(index_path_for(json_path), _hash_dataset(content),
+                       technical_skills, soft_skills, automaton, ngram_index)
 
 
 class SkillsLoader:
@@ -17,23 +106,48 @@ class SkillsLoader:
     Source: Kaggle resume_data.csv (multi-domaines)
     """
     
-    def __init__(self):
+    def __init__(self, fuzzy_backend: str = 'cdist', fuzzy_workers: int = 1,
+                 use_index: bool = True, generation: int = 1, strict: bool = False):
+        if fuzzy_backend not in FUZZY_BACKEND_NAMES:
+            raise ValueError(f"Moteur fuzzy inconnu: {fuzzy_backend}")
+        
         self.skills_data = None
         self.technical_skills = set()
         self.soft_skills = set()
         self.all_skills = set()
         
+        # Version du dataset chargé (empreinte du fichier JSON)
+        self.dataset_version = DEFAULT_DATASET_VERSION
+        
+        # Numéro de génération dans ce processus (incrémenté à chaque rechargement)
+        self.generation = generation
+        
+        # Structures de matching (construites au chargement)
+        self.automaton = None
+        self.ngram_index = None
+        
+        # Moteur de fuzzy matching ('cdist' vectorisé, 'ngram' indexé ou 'extract' historique)
+        self.fuzzy_backend = fuzzy_backend
+        self.fuzzy_workers = fuzzy_workers
+        
+        # Index binaire compilé (.skidx) utilisé s'il est à jour
+        self.use_index = use_index
+        self.index = None
+        
+        # Listes triées des compétences par catégorie (calculées à la demande)
+        self._category_skills = None
+        
+        # Strict (rechargement à chaud): un dataset absent ou illisible lève
+        # une exception au lieu de retomber sur la liste par défaut
+        self.strict = strict
+        
         # Charger les compétences
         self._load_skills_data()
     
     def _load_skills_data(self):
         """Charge les données depuis le fichier local"""
-        # Chemin vers les données
-        data_dir = Path(__file__).parent.parent.parent / "data"
-        
-        # Datasets disponibles (par ordre de priorité)
-        resume_complete_fr = data_dir / "resume_skills_complete_fr.json"
-        resume_complete = data_dir / "resume_skills_complete.json"
+        resume_complete_fr = RESUME_COMPLETE_FR
+        resume_complete = RESUME_COMPLETE
         
         # 1. Priorité ABSOLUE: Dataset en FRANÇAIS (2795 compétences)
         if resume_complete_fr.exists():
@@ -48,6 +162,8 @@ class SkillsLoader:
             self._load_from_json(resume_complete)
         
         # 3. Aucun dataset trouvé
+        elif self.strict:
+            raise FileNotFoundError("Aucun dataset de compétences trouvé")
         else:
             print("❌ Aucun dataset trouvé")
             print()
@@ -61,20 +177,31 @@ class SkillsLoader:
             self._load_default_skills()
     
     def _load_from_json(self, json_path: Path):
-        """Charge les compétences depuis le JSON"""
+        """Charge les compétences depuis le JSON (ou son index compilé à jour)"""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                content = f.read()
+            dataset_version = _hash_dataset(content)
             
-            self.technical_skills = set(data.get('technical_skills', []))
-            self.soft_skills = set(data.get('soft_skills', []))
-            self.all_skills = self.technical_skills | self.soft_skills
+            if self.use_index and self._load_from_index(json_path, dataset_version):
+                self.dataset_version = dataset_version
+            else:
+                data = json.loads(content.decode('utf-8'))
+                self.technical_skills = set(data.get('technical_skills', []))
+                self.soft_skills = set(data.get('soft_skills', []))
+                self.all_skills = self.technical_skills | self.soft_skills
+                self._build_matchers()
+                self.dataset_version = dataset_version
+                if self.use_index and settings.SKILLS_INDEX_AUTOBUILD:
+                    self._write_index(json_path)
             
             print(f"✅ {len(self.all_skills)} compétences chargées")
             print(f"   - Techniques: {len(self.technical_skills)}")
             print(f"   - Soft skills: {len(self.soft_skills)}")
         
         except Exception as e:
+            if self.strict:
+                raise
             print(f"❌ Erreur lors du chargement JSON: {e}")
             self._load_default_skills()
     
@@ -90,15 +217,70 @@ class SkillsLoader:
             'Critical Thinking', 'Creativity', 'Time Management'
         }
         self.all_skills = self.technical_skills | self.soft_skills
+        self._build_matchers()
+        self.dataset_version = DEFAULT_DATASET_VERSION
         print(f"⚠️ Utilisation de la liste par défaut ({len(self.all_skills)} compétences)")
     
-    def search_skills(self, text: str, threshold: int = 85) -> Dict[str, List[str]]:
+    def _build_matchers(self):
+        """Compile les structures de matching une seule fois par chargement"""
+        self.automaton, self.ngram_index = build_matchers(self.technical_skills, self.soft_skills)
+    
+    def _load_from_index(self, json_path: Path, dataset_version: str) -> bool:
+        """Mappe l'index compilé s'il correspond au JSON; False sinon"""
+        try:
+            index = load_index(index_path_for(json_path), dataset_version)
+        except Exception as e:
+            print(f"⚠️ Index compilé illisible, chargement depuis le JSON: {e}")
+            return False
+        if index is None:
+            return False
+        
+        self.index = index
+        self.technical_skills = index.technical_skills
+        self.soft_skills = index.soft_skills
+        self.all_skills = self.technical_skills | self.soft_skills
+        self.automaton = index.automaton
+        self.ngram_index = index.ngram_index
+        print(f"   ⚡ Index compilé: {index_path_for(json_path).name}")
+        return True
+    
+    def _write_index(self, json_path: Path):
+        """Écrit l'index compilé du dataset qui vient d'être chargé"""
+        try:
+            path = write_index(index_path_for(json_path), self.dataset_version,
+                               self.technical_skills, self.soft_skills,
+                               self.automaton, self.ngram_index)
+            print(f"   💾 Index compilé écrit: {path.name}")
+        except OSError as e:
+            # Dossier data en lecture seule: on garde le chargement JSON
+            print(f"⚠️ Index compilé non écrit: {e}")
+    
+    def _get_fuzzy_matcher(self, backend: str):
+        """Retourne la fonction de fuzzy matching du moteur demandé"""
+        if backend == 'ngram':
+            return self.ngram_index.match
+        if backend not in FUZZY_BACKENDS:
+            raise ValueError(f"Moteur fuzzy inconnu: {backend}")
+        return FUZZY_BACKENDS[backend]
+    
+    def _get_category_skills(self) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """Compétences de chaque catégorie, dans un ordre stable"""
+        if self._category_skills is None:
+            self._category_skills = (
+                ('technical', tuple(sorted(self.technical_skills))),
+                ('soft', tuple(sorted(self.soft_skills))),
+            )
+        return self._category_skills
+    
+    def search_skills(self, text: str, threshold: int = 85,
+                      fuzzy_backend: Optional[str] = None) -> Dict[str, List[str]]:
         """
         Recherche les compétences dans un texte
         
         Args:
             text: Texte à analyser
             threshold: Seuil de similarité pour fuzzy matching (0-100)
+            fuzzy_backend: 'cdist', 'ngram' ou 'extract' (par défaut: celui du loader)
         
         Returns:
             Dict avec 'technical' et 'soft' skills trouvées
@@ -109,41 +291,144 @@ class SkillsLoader:
             'soft': set()
         }
         
-        # 1. Recherche exacte (rapide)
-        for skill in self.technical_skills:
-            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower):
-                found_skills['technical'].add(skill)
-        
-        for skill in self.soft_skills:
-            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower):
-                found_skills['soft'].add(skill)
+        # 1. Recherche exacte (un seul parcours Aho-Corasick)
+        exact_matches = self.automaton.search(text_lower)
+        found_skills['technical'].update(exact_matches.get('technical', ()))
+        found_skills['soft'].update(exact_matches.get('soft', ()))
         
         # 2. Fuzzy matching (pour variations/typos)
+        fuzzy_match = self._get_fuzzy_matcher(fuzzy_backend or self.fuzzy_backend)
+        
         words = text.split()
         
-        # Technical skills fuzzy
-        for skill in self.technical_skills:
-            if skill in found_skills['technical']:
-                continue  # Déjà trouvé
-            
-            matches = process.extract(skill, words, scorer=fuzz.ratio, limit=1)
-            if matches and matches[0][1] >= threshold:
-                found_skills['technical'].add(skill)
-        
-        # Soft skills fuzzy
-        for skill in self.soft_skills:
-            if skill in found_skills['soft']:
-                continue
-            
-            matches = process.extract(skill, words, scorer=fuzz.ratio, limit=1)
-            if matches and matches[0][1] >= threshold:
-                found_skills['soft'].add(skill)
+        for category, skills in self._get_category_skills():
+            remaining = [s for s in skills if s not in found_skills[category]]
+            found_skills[category].update(
+                fuzzy_match(remaining, words, threshold, workers=self.fuzzy_workers)
+            )
         
         return {
             'technical': sorted(list(found_skills['technical'])),
             'soft': sorted(list(found_skills['soft']))
         }
     
+    def search_skills_chunk(self, texts: List[str], threshold: int = 85,
+                            fuzzy_backend: Optional[str] = None,
+                            fuzzy_workers: Optional[int] = None) -> List[Dict[str, List[str]]]:
+        """
+        Recherche les compétences dans une liste de textes (mêmes résultats
+        que search_skills appelé sur chaque texte)
+        
+        Avec le moteur 'cdist', le fuzzy matching du lot se fait en une seule
+        matrice sur l'union des tokens: les mots communs aux textes ne sont
+        scorés qu'une fois. Les autres moteurs sont appelés texte par texte.
+        """
+        backend = fuzzy_backend or self.fuzzy_backend
+        fuzzy_match = self._get_fuzzy_matcher(backend)
+        workers = self.fuzzy_workers if fuzzy_workers is None else fuzzy_workers
+        
+        # 1. Recherche exacte
+        found = []
+        for text in texts:
+            exact_matches = self.automaton.search(text.lower())
+            found.append({
+                'technical': set(exact_matches.get('technical', ())),
+                'soft': set(exact_matches.get('soft', ()))
+            })
+        
+        # 2. Fuzzy matching
+        word_lists = [text.split() for text in texts]
+        for category, skills in self._get_category_skills():
+            if backend == 'cdist':
+                # Une compétence déjà trouvée en exact peut être rescorée:
+                # l'union est la même, et la matrice reste commune au lot
+                matches = fuzzy_match_cdist_batch(skills, word_lists, threshold, workers=workers)
+            else:
+                matches = [
+                    fuzzy_match([s for s in skills if s not in found_skills[category]],
+                                words, threshold, workers=workers)
+                    for found_skills, words in zip(found, word_lists)
+                ]
+            for found_skills, matched in zip(found, matches):
+                found_skills[category].update(matched)
+        
+        return [
+            {
+                'technical': sorted(found_skills['technical']),
+                'soft': sorted(found_skills['soft'])
+            }
+            for found_skills in found
+        ]
+    
+    def search_skills_batch(self, texts: Iterable[str], threshold: int = 85,
+                            fuzzy_backend: Optional[str] = None, workers: int = 1,
+                            use_processes: bool = False,
+                            chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Dict[str, List[str]]]:
+        """
+        Recherche les compétences dans un grand nombre de textes
+        (ré-indexation des CV, offres d'un scraping complet)
+        
+        Les textes sont lus par paquets de `chunk_size` au fil de l'itération
+        et les résultats rendus dans l'ordre d'entrée: au plus 2 paquets par
+        worker sont en cours, la mémoire reste constante quel que soit le corpus.
+        
+        Args:
+            texts: Textes à analyser (itérable quelconque, même un générateur)
+            threshold: Seuil de similarité pour fuzzy matching (0-100)
+            fuzzy_backend: 'cdist', 'ngram' ou 'extract' (par défaut: celui du loader)
+            workers: Nombre de workers (1 = dans le thread appelant)
+            use_processes: Pool de processus au lieu de threads (la recherche
+                exacte est en Python pur et ne profite pas des threads)
+            chunk_size: Nombre de textes par tâche
+        
+        Yields:
+            Dict avec 'technical' et 'soft' skills trouvées, un par texte
+        """
+        backend = fuzzy_backend or self.fuzzy_backend
+        # Valide le moteur avant de démarrer un pool
+        self._get_fuzzy_matcher(backend)
+        
+        iterator = iter(texts)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        
+        if workers <= 1:
+            for chunk in chunks:
+                yield from self.search_skills_chunk(chunk, threshold, backend)
+            return
+        
+        if use_processes:
+            # Chaque processus utilise sa génération courante du loader
+            # (héritée au fork, ou mappée depuis l'index compilé)
+            executor = ProcessPoolExecutor(max_workers=workers)
+            task = _search_skills_chunk_in_process
+        else:
+            # Le parallélisme vient du pool: rapidfuzz en un seul thread par tâche
+            executor = ThreadPoolExecutor(max_workers=workers,
+                                          thread_name_prefix="skills-batch")
+            task = self.search_skills_chunk
+        
+        pending = deque()
+        try:
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(task, chunk, threshold, backend, 1))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Générateur abandonné en cours de route: les paquets pas encore démarrés sont annulés
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def get_ngram_stats(self, text: str, threshold: int = 85) -> Dict:
+        """
+        Statistiques de l'index de trigrammes pour un texte
+        (candidats comparés, taux de pruning) - pour régler min_overlap
+        """
+        _, stats = self.ngram_index.match_with_stats(
+            sorted(self.all_skills), text.split(), threshold
+        )
+        return stats
+    
     def is_technical_skill(self, skill: str) -> bool:
         """Vérifie si une compétence est technique"""
         return skill in self.technical_skills
@@ -161,17 +446,135 @@ class SkillsLoader:
         return {
             'total_skills': len(self.all_skills),
             'technical_skills': len(self.technical_skills),
-            'soft_skills': len(self.soft_skills)
+            'soft_skills': len(self.soft_skills),
+            'dataset_version': self.dataset_version,
+            'generation': self.generation,
+            'compiled_index': self.index is not None
         }
 
 
-# Instance globale (singleton)
+# Génération courante (publiée par un simple échange de référence: les
+# extractions en cours gardent celle qu'elles ont obtenue)
 _skills_loader = None
+_skills_loader_lock = threading.Lock()
+
+# Rechargement en arrière-plan
+_reload_thread: Optional[threading.Thread] = None
+_reload_lock = threading.Lock()
+# Surveillance du dataset sur disque (un thread par processus)
+_watch_thread: Optional[threading.Thread] = None
+# Version du dataset dont le dernier rechargement a échoué: la surveillance
+# ne réessaie qu'une fois le fichier modifié
+_failed_dataset_version: Optional[str] = None
+
+
+def _reset_after_fork():
+    """Processus enfant (fork): les threads du parent n'y existent pas"""
+    global _reload_lock, _watch_thread
+    _reload_lock = threading.Lock()
+    _watch_thread = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _new_generation(generation: int, strict: bool = False) -> SkillsLoader:
+    return SkillsLoader(
+        fuzzy_backend=settings.SKILLS_FUZZY_BACKEND,
+        fuzzy_workers=settings.SKILLS_FUZZY_WORKERS,
+        use_index=settings.SKILLS_INDEX_ENABLED,
+        generation=generation,
+        strict=strict,
+    )
+
+
+def _search_skills_chunk_in_process(texts: List[str], threshold: int, fuzzy_backend: str,
+                                    fuzzy_workers: int) -> List[Dict[str, List[str]]]:
+    """Tâche de search_skills_batch exécutée dans un processus du pool"""
+    return get_skills_loader().search_skills_chunk(texts, threshold, fuzzy_backend, fuzzy_workers)
+
 
 def get_skills_loader() -> SkillsLoader:
-    """Retourne l'instance globale du loader (singleton)"""
+    """
+    Retourne la génération courante du loader
+    
+    Ne fait aucune I/O: les changements du dataset sur disque sont détectés
+    par le thread de surveillance, qui publie la nouvelle génération.
+    """
     global _skills_loader
     if _skills_loader is None:
-        _skills_loader = SkillsLoader()
+        with _skills_loader_lock:
+            if _skills_loader is None:
+                _skills_loader = _new_generation(1)
+    if _watch_thread is None and settings.SKILLS_RELOAD_INTERVAL > 0:
+        _start_dataset_watcher()
     return _skills_loader
 
+
+def _start_dataset_watcher():
+    global _watch_thread
+    with _reload_lock:
+        if _watch_thread is None:
+            _watch_thread = threading.Thread(
+                target=_watch_dataset, name="skills-watch", daemon=True
+            )
+            _watch_thread.start()
+
+
+def _watch_dataset():
+    """Toutes les SKILLS_RELOAD_INTERVAL secondes: recharge si le dataset a changé"""
+    while True:
+        time.sleep(settings.SKILLS_RELOAD_INTERVAL)
+        try:
+            version = get_dataset_version()
+            if version not in (_skills_loader.dataset_version, _failed_dataset_version):
+                reload_skills_loader(wait=True)
+        except Exception as e:
+            print(f"❌ Vérification du référentiel échouée: {e}")
+
+
+def _build_and_publish():
+    global _skills_loader, _failed_dataset_version
+    current = _skills_loader
+    try:
+        # Rechargement strict: un JSON tronqué ne remplace pas la génération
+        # courante par la liste par défaut
+        loader = _new_generation(current.generation + 1 if current else 1,
+                                 strict=current is not None)
+    except Exception as e:
+        try:
+            _failed_dataset_version = get_dataset_version()
+        except OSError:
+            _failed_dataset_version = None
+        print(f"❌ Rechargement du référentiel échoué (génération conservée): {e}")
+        return
+    _failed_dataset_version = None
+    _skills_loader = loader
+    print(f"🔄 Référentiel rechargé: génération {loader.generation} "
+          f"(dataset {loader.dataset_version})")
+
+
+def reload_skills_loader(wait: bool = False) -> bool:
+    """
+    Construit une nouvelle génération en arrière-plan puis la publie
+    
+    Args:
+        wait: attendre la fin de la construction (tests, scripts)
+    
+    Returns:
+        False si un rechargement est déjà en cours
+    """
+    global _reload_thread
+    with _reload_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            started = False
+        else:
+            _reload_thread = threading.Thread(
+                target=_build_and_publish, name="skills-reload", daemon=True
+            )
+            _reload_thread.start()
+            started = True
+        thread = _reload_thread
+    if wait:
+        thread.join()
+    return started
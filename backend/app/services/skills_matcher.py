@@ -0,0 +1,442 @@
+"""
+Structures de matching compilées pour le référentiel de compétences
+
+Construites une seule fois au chargement du dataset par SkillsLoader,
+puis partagées par toutes les extractions.
+"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+from math import ceil
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# rapidfuzz est importé à la première utilisation (import du module léger)
+
+# Nombre de compétences scorées par appel cdist (borne la mémoire de la matrice)
+CDIST_CHUNK_SIZE = 512
+
+# Taille des n-grammes de caractères de l'index de candidats
+NGRAM_SIZE = 3
+
+
+def _is_word_char(char: str) -> bool:
+    """Équivalent de la classe \\w de `re` (mode Unicode)"""
+    return char.isalnum() or char == '_'
+
+
+class SkillAutomaton:
+    """
+    Automate Aho-Corasick multi-motifs pour la recherche exacte
+
+    Remplace les ~2800 appels `re.search(r'\\b' + skill + r'\\b')` par un
+    seul parcours linéaire du texte en minuscules. La sémantique des
+    frontières de mots `\\b` est reproduite à l'identique, y compris pour
+    les compétences qui commencent ou finissent par un symbole (".Net", "C++").
+    """
+
+    def __init__(self, skills_by_category: Dict[str, Iterable[str]]):
+        # Motif (minuscules) -> compétences d'origine par catégorie
+        self.patterns: List[str] = []
+        self.skills: List[List[Tuple[str, str]]] = []
+        # Frontière attendue avant/après le motif: True si le motif
+        # commence/finit par un caractère de mot
+        self._word_start: List[bool] = []
+        self._word_end: List[bool] = []
+
+        # Tables de l'automate: un dict de transitions par état (clés
+        # caractères, la forme la plus rapide à parcourir en Python)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        pattern_ids: Dict[str, int] = {}
+        for category, skills in skills_by_category.items():
+            for skill in skills:
+                pattern = skill.lower()
+                if not pattern:
+                    continue
+                pattern_id = pattern_ids.get(pattern)
+                if pattern_id is None:
+                    pattern_id = self._add_pattern(pattern)
+                    pattern_ids[pattern] = pattern_id
+                self.skills[pattern_id].append((category, skill))
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_tables(cls, patterns: List[str], skills: List[List[Tuple[str, str]]],
+                    goto: List[Dict[str, int]], fail: List[int],
+                    out: List[Tuple[int, ...]]) -> 'SkillAutomaton':
+        """Reconstruit l'automate à partir de tables précompilées (index binaire)"""
+        automaton = cls.__new__(cls)
+        automaton.patterns = patterns
+        automaton.skills = skills
+        automaton._word_start = [_is_word_char(pattern[0]) for pattern in patterns]
+        automaton._word_end = [_is_word_char(pattern[-1]) for pattern in patterns]
+        automaton._goto = goto
+        automaton._fail = fail
+        automaton._out = out
+        return automaton
+
+    def tables(self) -> Tuple[List[Dict[str, int]], List[int], List[Tuple[int, ...]]]:
+        """Transitions, liens d'échec et sorties par état (pour l'index binaire)"""
+        return self._goto, self._fail, self._out
+
+    def _add_pattern(self, pattern: str) -> int:
+        """Insère un motif dans le trie et retourne son identifiant"""
+        pattern_id = len(self.patterns)
+        self.patterns.append(pattern)
+        self.skills.append([])
+        self._word_start.append(_is_word_char(pattern[0]))
+        self._word_end.append(_is_word_char(pattern[-1]))
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._out[state] = self._out[state] + (pattern_id,)
+        return pattern_id
+
+    def _build_failure_links(self):
+        """Calcule les liens d'échec (parcours en largeur)"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                # Sorties héritées du suffixe le plus long
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find_patterns(self, text_lower: str) -> Set[int]:
+        """
+        Retourne les identifiants des motifs présents dans le texte,
+        délimités par des frontières de mots (sémantique `\\b`)
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self.patterns
+        word_start = self._word_start
+        word_end = self._word_end
+
+        found: Set[int] = set()
+        text_length = len(text_lower)
+        state = 0
+
+        for index, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if not out[state]:
+                continue
+
+            end = index + 1
+            after_is_word = end < text_length and _is_word_char(text_lower[end])
+
+            for pattern_id in out[state]:
+                if pattern_id in found:
+                    continue
+                # \b en fin de motif
+                if word_end[pattern_id] == after_is_word:
+                    continue
+                # \b en début de motif
+                start = end - len(patterns[pattern_id])
+                before_is_word = start > 0 and _is_word_char(text_lower[start - 1])
+                if word_start[pattern_id] == before_is_word:
+                    continue
+                found.add(pattern_id)
+
+        return found
+
+    def search(self, text_lower: str) -> Dict[str, Set[str]]:
+        """Recherche exacte, résultats regroupés par catégorie"""
+        found: Dict[str, Set[str]] = {}
+        for pattern_id in self.find_patterns(text_lower):
+            for category, skill in self.skills[pattern_id]:
+                found.setdefault(category, set()).add(skill)
+        return found
+
+
+# ============================================================================
+# FUZZY MATCHING
+# ============================================================================
+
+def fuzzy_match_extract(skills: Sequence[str], words: Sequence[str], threshold: int,
+                        workers: int = 1) -> Set[str]:
+    """
+    Moteur historique: un `process.extract` par compétence
+
+    Conservé pour comparer les résultats avec le moteur vectorisé.
+    """
+    from rapidfuzz import fuzz, process
+
+    matched = set()
+    for skill in skills:
+        matches = process.extract(skill, words, scorer=fuzz.ratio, limit=1)
+        if matches and matches[0][1] >= threshold:
+            matched.add(skill)
+    return matched
+
+
+def fuzzy_match_cdist(skills: Sequence[str], words: Sequence[str], threshold: int,
+                      workers: int = 1) -> Set[str]:
+    """
+    Moteur vectorisé: score de la matrice compétences x tokens uniques
+    en un appel natif `process.cdist` par bloc de compétences
+    """
+    from rapidfuzz import fuzz, process
+
+    skills = list(skills)
+    # Les doublons ne changent pas le meilleur score d'une compétence
+    tokens = list(dict.fromkeys(words))
+    if not skills or not tokens:
+        return set()
+
+    matched = set()
+    for offset in range(0, len(skills), CDIST_CHUNK_SIZE):
+        chunk = skills[offset:offset + CDIST_CHUNK_SIZE]
+        scores = process.cdist(
+            chunk, tokens,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            workers=workers,
+        )
+        best_scores = scores.max(axis=1)
+        matched.update(
+            skill for skill, score in zip(chunk, best_scores) if score >= threshold
+        )
+    return matched
+
+
+def fuzzy_match_cdist_batch(skills: Sequence[str], word_lists: Sequence[Sequence[str]],
+                            threshold: int, workers: int = 1) -> List[Set[str]]:
+    """
+    Variante par lot de fuzzy_match_cdist
+
+    Une seule matrice compétences x tokens uniques de tout le lot (un token
+    présent dans plusieurs textes n'est scoré qu'une fois), puis le meilleur
+    score de chaque texte sur ses propres colonnes.
+    """
+    import numpy as np
+    from rapidfuzz import fuzz, process
+
+    skills = list(skills)
+    token_ids: Dict[str, int] = {}
+    columns = [
+        np.fromiter(
+            dict.fromkeys(token_ids.setdefault(word, len(token_ids)) for word in words),
+            dtype=np.intp,
+        )
+        for words in word_lists
+    ]
+    matched: List[Set[str]] = [set() for _ in word_lists]
+    if not skills or not token_ids:
+        return matched
+
+    tokens = list(token_ids)
+    for offset in range(0, len(skills), CDIST_CHUNK_SIZE):
+        chunk = skills[offset:offset + CDIST_CHUNK_SIZE]
+        scores = process.cdist(
+            chunk, tokens,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            workers=workers,
+        )
+        for found, cols in zip(matched, columns):
+            if len(cols):
+                best_scores = scores[:, cols].max(axis=1)
+                found.update(chunk[i] for i in np.flatnonzero(best_scores >= threshold))
+    return matched
+
+
+def _char_ngrams(text: str) -> Set[str]:
+    """Trigrammes de caractères distincts (minuscules, bornes marquées par des espaces)"""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def _token_windows(words: Sequence[str], max_words: int) -> List[str]:
+    """Fenêtres glissantes de 1 à max_words tokens consécutifs (uniques)"""
+    windows = {}
+    for size in range(1, max_words + 1):
+        for start in range(len(words) - size + 1):
+            windows[' '.join(words[start:start + size])] = None
+    return list(windows)
+
+
+class SkillNgramIndex:
+    """
+    Index inversé de trigrammes de caractères sur les compétences
+
+    Pour chaque token du CV (et chaque fenêtre glissante de plusieurs
+    tokens, pour "Gestion de projets"), seules les compétences qui
+    partagent assez de trigrammes et dont la longueur est compatible avec
+    le seuil sont comparées avec `fuzz.ratio`.
+
+    Les identifiants sont attribués par longueur croissante: la bande de
+    longueurs compatibles avec le seuil (filtre exact, la distance indel
+    est au moins l'écart de longueur) est une tranche contiguë de chaque
+    liste de postings. Le filtre de trigrammes est heuristique et se règle
+    avec `min_overlap` à partir de `match_with_stats`.
+    """
+
+    def __init__(self, skills: Iterable[str], max_words: int = 4, min_overlap: float = 0.5):
+        self.skills: List[str] = sorted(set(skills), key=lambda skill: (len(skill), skill))
+        self.max_words = max_words
+        self.min_overlap = min_overlap
+
+        self._skill_ids: Dict[str, int] = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+        self._lengths: List[int] = [len(skill) for skill in self.skills]
+        self._ngram_counts: Sequence[int] = []
+        # (longueur de fenêtre, seuil) -> tranche de longueurs compatibles
+        self._bands: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        # Trigramme -> identifiants des compétences (triés, donc par longueur)
+        self._postings: Dict[str, Sequence[int]] = {}
+
+        for skill_id, skill in enumerate(self.skills):
+            ngrams = _char_ngrams(skill)
+            self._ngram_counts.append(len(ngrams))
+            for ngram in ngrams:
+                self._postings.setdefault(ngram, []).append(skill_id)
+
+    @classmethod
+    def from_tables(cls, skills: List[str], postings: Dict[str, Sequence[int]],
+                    ngram_counts: Sequence[int], max_words: int = 4,
+                    min_overlap: float = 0.5) -> 'SkillNgramIndex':
+        """
+        Reconstruit l'index à partir de tables précompilées (index binaire)
+
+        `skills` doit être dans l'ordre des identifiants (longueur, texte);
+        les postings peuvent être des vues sur un fichier mappé en mémoire.
+        """
+        index = cls.__new__(cls)
+        index.skills = skills
+        index.max_words = max_words
+        index.min_overlap = min_overlap
+        index._skill_ids = {skill: skill_id for skill_id, skill in enumerate(skills)}
+        index._lengths = [len(skill) for skill in skills]
+        index._ngram_counts = ngram_counts
+        index._bands = {}
+        index._postings = postings
+        return index
+
+    def tables(self) -> Tuple[Dict[str, Sequence[int]], Sequence[int]]:
+        """Postings et nombre de trigrammes par compétence (pour l'index binaire)"""
+        return self._postings, self._ngram_counts
+
+    def _length_band(self, length: int, threshold: int) -> Tuple[int, int, int]:
+        """
+        Tranche [début, fin) des identifiants de longueur compatible avec
+        le seuil, et nombre minimal de trigrammes d'une compétence de la tranche
+        """
+        key = (length, threshold)
+        band = self._bands.get(key)
+        if band is None:
+            max_distance_ratio = (100 - threshold) / 100
+            if max_distance_ratio >= 1:
+                first, last = 0, len(self.skills)
+            else:
+                low = length * (1 - max_distance_ratio) / (1 + max_distance_ratio)
+                high = length * (1 + max_distance_ratio) / (1 - max_distance_ratio)
+                first = bisect_left(self._lengths, low - 1e-9)
+                last = bisect_right(self._lengths, high + 1e-9)
+            min_count = min(self._ngram_counts[first:last], default=0)
+            band = self._bands[key] = (first, last, min_count)
+        return band
+
+    def candidates(self, window: str, threshold: int,
+                   allowed: Optional[Set[int]] = None) -> List[int]:
+        """Compétences candidates pour une fenêtre de texte"""
+        first, last, band_min_count = self._length_band(len(window), threshold)
+        if first >= last:
+            return []
+
+        ngrams = _char_ngrams(window)
+        window_count = len(ngrams)
+
+        # Filtre par préfixe: un candidat qui partage au moins `required`
+        # trigrammes en partage forcément un parmi les (n - required + 1)
+        # plus rares; les trigrammes fréquents ("es ", "ion") ne servent
+        # qu'à la vérification.
+        required = max(1, ceil(self.min_overlap * min(band_min_count, window_count)))
+        postings_by_rarity = sorted(
+            (self._postings[ngram] for ngram in ngrams if ngram in self._postings),
+            key=len,
+        )
+
+        probed: Set[int] = set()
+        for postings in postings_by_rarity[:window_count - required + 1]:
+            probed.update(postings[bisect_left(postings, first):bisect_left(postings, last)])
+        if allowed is not None:
+            probed &= allowed
+        return list(probed)
+
+    def match_with_stats(self, skills: Sequence[str], words: Sequence[str],
+                         threshold: int) -> Tuple[Set[str], Dict]:
+        """
+        Fuzzy matching restreint aux candidats de l'index
+
+        Returns:
+            (compétences trouvées, statistiques de pruning)
+        """
+        from rapidfuzz import fuzz, process
+
+        allowed = {self._skill_ids[skill] for skill in skills if skill in self._skill_ids}
+        windows = _token_windows(list(words), self.max_words)
+
+        matched_ids: Set[int] = set()
+        candidate_count = 0
+        for window in windows:
+            # Les compétences déjà trouvées ne sont plus comparées
+            shortlist = [skill_id for skill_id in self.candidates(window, threshold, allowed)
+                         if skill_id not in matched_ids]
+            if not shortlist:
+                continue
+            candidate_count += len(shortlist)
+            # Un seul appel natif par fenêtre sur la liste restreinte
+            results = process.extract(
+                window, [self.skills[skill_id] for skill_id in shortlist],
+                scorer=fuzz.ratio, score_cutoff=threshold, limit=None,
+            )
+            matched_ids.update(shortlist[index] for _, score, index in results if score >= threshold)
+
+        total_pairs = len(windows) * len(allowed)
+        stats = {
+            'skills': len(allowed),
+            'windows': len(windows),
+            'pairs': total_pairs,
+            'candidates': candidate_count,
+            'prune_ratio': 1 - candidate_count / total_pairs if total_pairs else 0.0,
+            'matched': len(matched_ids),
+        }
+        return {self.skills[skill_id] for skill_id in matched_ids}, stats
+
+    def match(self, skills: Sequence[str], words: Sequence[str], threshold: int,
+              workers: int = 1) -> Set[str]:
+        """Même signature que les moteurs de FUZZY_BACKENDS"""
+        matched, _ = self.match_with_stats(skills, words, threshold)
+        return matched
+
+
+FUZZY_BACKENDS = {
+    'extract': fuzzy_match_extract,
+    'cdist': fuzzy_match_cdist,
+}
+
+# Moteurs disponibles ('ngram' dépend de l'index construit par le loader)
+FUZZY_BACKEND_NAMES = ('extract', 'cdist', 'ngram')
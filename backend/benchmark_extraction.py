@@ -0,0 +1,235 @@
+"""
+Benchmark de l'extraction sur le dataset UpdatedResumeDataSet.csv
+Mesure SkillsLoader.search_skills, CVExtractorV3._parse_cv_text et chaque
+sous-extracteur: débit (CV/s), latences p50/p95/p99, RSS max, temps par étape.
+Les résultats sont sauvés en JSON pour comparer deux runs (--compare).
+
+Usage: python benchmark_extraction.py [--limit 300] [--output fichier.json]
+                                      [--compare ancien.json] [--tolerance 0.1]
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.cv_extractor_v3 import EXTRACTOR_VERSION, get_extractor
+
+DEFAULT_CSV = Path(__file__).parent / "data" / "UpdatedResumeDataSet.csv"
+RESULTS_DIR = Path(__file__).parent / "benchmarks"
+
+# CV non mesurés avant le run (imports paresseux, caches)
+WARMUP_CVS = 5
+
+# Métriques comparées par --compare: (nom, True si plus grand = mieux)
+COMPARED_METRICS = [
+    ("cvs_per_s", True),
+    ("p50_ms", False),
+    ("p95_ms", False),
+]
+
+# Écart absolu (ms par CV) en dessous duquel une variation est du bruit
+NOISE_FLOOR_MS = 0.1
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def load_resumes(csv_path: Path, limit: Optional[int]) -> List[str]:
+    """Textes des CV dans l'ordre du fichier (run reproductible)"""
+    csv.field_size_limit(2**31 - 1)
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        resumes = [row['Resume'] for row in csv.DictReader(f) if row['Resume'].strip()]
+    return resumes[:limit] if limit else resumes
+
+
+def peak_rss_mb() -> Optional[float]:
+    """RSS maximal du processus (None si non disponible, ex: Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: Ko, macOS: octets
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def summarize(latencies: List[float]) -> Dict:
+    """Débit et percentiles (latences en secondes)"""
+    total = sum(latencies)
+    summary = {
+        "count": len(latencies),
+        "total_s": round(total, 4),
+        "cvs_per_s": round(len(latencies) / total, 2) if total else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+    }
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        summary.update(
+            p50_ms=round(cuts[49] * 1000, 3),
+            p95_ms=round(cuts[94] * 1000, 3),
+            p99_ms=round(cuts[98] * 1000, 3),
+        )
+    return summary
+
+
+def time_calls(func: Callable, items: List) -> List[float]:
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_stages(extractor, text: str, timings: Dict[str, List[float]]):
+    """
+    Rejoue les étapes de _parse_cv_text en chronométrant chacune
+    (mêmes entrées, même ordre)
+    """
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.setdefault(stage, []).append(time.perf_counter() - start)
+        return result
+
+    lines = timed("regroup_lines", extractor._regroup_logical_lines, text.split('\n'))
+    timed("name", extractor._extract_name_intelligent, lines)
+    timed("email", extractor._extract_email, text)
+    timed("phone", extractor._extract_phone, text)
+    timed("city", extractor._extract_city, text)
+    sections = timed("sections", extractor._detect_sections_fuzzy, lines)
+    timed("skills", extractor._extract_skills_esco, text, sections.get('competences', []))
+    timed("experience", extractor._extract_experiences_robust, text, sections.get('experience', []))
+    timed("education", extractor._extract_education_robust, text, sections.get('formation', []))
+    timed("languages", extractor._extract_languages_with_levels, text, sections.get('langues', []))
+
+
+def run_benchmark(resumes: List[str]) -> Dict:
+    extractor = get_extractor()
+    skills_loader = extractor.skills_loader
+
+    for text in resumes[:WARMUP_CVS]:
+        extractor._parse_cv_text(text, text.split('\n'))
+
+    print_section(f"Benchmark sur {len(resumes)} CV")
+
+    benchmarks = {
+        "search_skills": summarize(time_calls(skills_loader.search_skills, resumes)),
+        "parse_cv_text": summarize(time_calls(
+            lambda text: extractor._parse_cv_text(text, text.split('\n')), resumes
+        )),
+    }
+    for name, summary in benchmarks.items():
+        print(f"✓ {name}: {summary['cvs_per_s']} CV/s, p50 {summary.get('p50_ms')} ms, "
+              f"p95 {summary.get('p95_ms')} ms, p99 {summary.get('p99_ms')} ms")
+
+    timings: Dict[str, List[float]] = {}
+    for text in resumes:
+        run_stages(extractor, text, timings)
+
+    stages_total = sum(sum(values) for values in timings.values())
+    stages = {}
+    print("\nTemps par étape:")
+    for stage, values in timings.items():
+        summary = summarize(values)
+        summary["share"] = round(sum(values) / stages_total, 4) if stages_total else None
+        stages[stage] = summary
+        print(f"   {stage:<14} {summary['total_s']:>8.3f}s  {summary['share']:>6.1%}  "
+              f"p95 {summary.get('p95_ms')} ms")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "extractor_version": EXTRACTOR_VERSION,
+            "dataset_version": skills_loader.dataset_version,
+            "fuzzy_backend": skills_loader.fuzzy_backend,
+            "compiled_index": skills_loader.index is not None,
+            "cv_count": len(resumes),
+            "warmup_cvs": WARMUP_CVS,
+        },
+        "benchmarks": benchmarks,
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare deux runs (benchmarks et étapes)
+
+    Returns:
+        Les métriques dégradées de plus de `tolerance` (fraction)
+    """
+    print_section(f"Comparaison avec {baseline['meta']['timestamp']} (tolérance {tolerance:.0%})")
+    regressions = []
+
+    for group in ("benchmarks", "stages"):
+        for name, summary in results[group].items():
+            previous = baseline.get(group, {}).get(name)
+            if not previous:
+                continue
+            for metric, higher_is_better in COMPARED_METRICS:
+                old, new = previous.get(metric), summary.get(metric)
+                if not old or not new:
+                    continue
+                # Débit ramené en ms par CV pour le seuil de bruit
+                delta_ms = abs(1000 / new - 1000 / old) if higher_is_better else abs(new - old)
+                if delta_ms < NOISE_FLOOR_MS:
+                    continue
+                change = (new - old) / old
+                worse = -change if higher_is_better else change
+                flag = "❌" if worse > tolerance else "✓"
+                print(f"{flag} {group}.{name}.{metric}: {old} -> {new} ({change:+.1%})")
+                if worse > tolerance:
+                    regressions.append(f"{group}.{name}.{metric}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'extraction de CV")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--limit", type=int, default=None, help="Nombre de CV (défaut: tous)")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="Résultats JSON d'un run précédent")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.csv, args.limit)
+    results = run_benchmark(resumes)
+    print(f"\nRSS max: {results['peak_rss_mb']} Mo (fuzzy: {settings.SKILLS_FUZZY_BACKEND})")
+
+    output = args.output or RESULTS_DIR / f"extraction_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"💾 Résultats: {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Régressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ Aucune régression")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Compile le référentiel de compétences en index binaire (.skidx)
+Le JSON reste la source de vérité: à relancer après chaque modification
+(le serveur ignore un index périmé et le reconstruit s'il le peut)
+
+Usage: python build_skills_index.py [chemin/vers/dataset.json]
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import time
+from pathlib import Path
+
+from app.services.skills_loader import build_skills_index
+
+
+def main():
+    json_path = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    start = time.perf_counter()
+    index_path = build_skills_index(json_path)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Index compilé: {index_path}")
+    print(f"   Taille: {index_path.stat().st_size / 1024:.0f} Ko")
+    print(f"   Durée: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+-- Migration pour la pagination par curseur des offres (/api/offers, /api/offers/search)
+-- Exécuter ce script dans PostgreSQL sur une base existante:
+-- les nouvelles bases ont déjà l'index (Base.metadata.create_all)
+
+-- Se connecter à la base de données smarthire_db
+-- psql -U postgres -d smarthire_db -f offers_listing_migration.sql
+
+-- Index composite de la clé de tri (date de publication, id); les offres sans
+-- date sont classées en dernier (doit rester identique à OFFER_SORT_DATE dans
+-- app/models/offer.py). CONCURRENTLY: les écritures continuent pendant la construction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scraped_offers_listing
+    ON scraped_offers (coalesce(date_publication, DATE '0001-01-01') DESC, id DESC);
+
+ANALYZE scraped_offers;
+
+-- Vérifier qu'une page profonde lit l'index à partir du curseur (Index Scan using ix_scraped_offers_listing)
+EXPLAIN ANALYZE
+SELECT id, titre
+FROM scraped_offers
+WHERE est_active = TRUE
+  AND (coalesce(date_publication, DATE '0001-01-01'), id) < (DATE '2024-01-01', 1000)
+ORDER BY coalesce(date_publication, DATE '0001-01-01') DESC, id DESC
+LIMIT 51;
@@ -0,0 +1,34 @@
+-- Migration pour la recherche plein texte des offres (/api/offers/search)
+-- Exécuter ce script dans PostgreSQL (12 ou plus) sur une base existante:
+-- les nouvelles bases ont déjà la colonne et l'index (Base.metadata.create_all)
+
+-- Se connecter à la base de données smarthire_db
+-- psql -U postgres -d smarthire_db -f offers_search_migration.sql
+
+-- Colonne tsvector générée: titre (poids A) au-dessus de la description (poids B),
+-- chacun analysé en français et en anglais
+-- (doit rester identique à SEARCH_VECTOR_EXPRESSION dans app/models/offer.py)
+-- ⚠️ Réécrit la table: verrou exclusif le temps du calcul sur les offres existantes
+ALTER TABLE scraped_offers ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(titre, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(titre, '')), 'A') ||
+        setweight(to_tsvector('french', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+-- Index GIN (CONCURRENTLY: les écritures continuent pendant la construction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scraped_offers_search_vector
+    ON scraped_offers USING gin (search_vector);
+
+ANALYZE scraped_offers;
+
+-- Vérifier que la recherche utilise l'index (Bitmap Index Scan on ix_scraped_offers_search_vector)
+EXPLAIN ANALYZE
+SELECT id, titre
+FROM scraped_offers
+WHERE search_vector @@ (websearch_to_tsquery('french', 'développeur python')
+                        || websearch_to_tsquery('english', 'développeur python'))
+ORDER BY ts_rank(search_vector, websearch_to_tsquery('french', 'développeur python')
+                                || websearch_to_tsquery('english', 'développeur python')) DESC
+LIMIT 50;
@@ -0,0 +1,30 @@
+-- Migration pour les filtres ville / type de contrat des offres (ILIKE '%...%')
+-- Exécuter ce script dans PostgreSQL sur une base existante:
+-- les nouvelles bases ont déjà l'extension et les index (Base.metadata.create_all)
+
+-- Se connecter à la base de données smarthire_db
+-- psql -U postgres -d smarthire_db -f offers_trigram_migration.sql
+
+-- Extension trigrammes (extension "trusted" depuis PostgreSQL 13: le
+-- propriétaire de la base peut la créer)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Index GIN trigrammes (CONCURRENTLY: les écritures continuent pendant la construction)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scraped_offers_ville_trgm
+    ON scraped_offers USING gin (ville gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scraped_offers_type_contrat_trgm
+    ON scraped_offers USING gin (type_contrat gin_trgm_ops);
+
+-- L'ancien B-tree sur ville ne sert aucun filtre ILIKE '%...%'
+DROP INDEX CONCURRENTLY IF EXISTS ix_scraped_offers_ville;
+
+ANALYZE scraped_offers;
+
+-- Vérifier que le filtre utilise l'index (Bitmap Index Scan on ix_scraped_offers_ville_trgm)
+-- Les motifs de moins de 3 caractères ne produisent pas de trigramme: parcours séquentiel
+EXPLAIN ANALYZE
+SELECT id, titre
+FROM scraped_offers
+WHERE est_active = TRUE AND ville ILIKE '%casa%'
+ORDER BY date_publication DESC
+LIMIT 50;
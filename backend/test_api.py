@@ -145,8 +145,11 @@ def test_get_offers():
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            offers = response.json()
+            page = response.json()
+            offers = page["items"]
             print(f"✓ {len(offers)} offres trouvées")
+            if page["next_cursor"]:
+                print(f"  Page suivante: ?cursor={page['next_cursor']}")
             
             if len(offers) > 0:
                 print(f"\nPremière offre:")
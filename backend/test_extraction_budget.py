@@ -0,0 +1,107 @@
+"""
+Script de vérification du budget de traitement d'un CV
+
+- cap_lines: le texte joint ne dépasse jamais max_chars, y compris quand le
+  retour à la ligne remplit à lui seul le plafond
+- photo trop grande: refusée sur la taille lue dans l'en-tête, sans décodage
+- OCR de plusieurs pages: une page pas encore démarrée à l'échéance est
+  ignorée au lieu de démarrer avec un délai complet
+
+Usage: python test_extraction_budget.py   (depuis backend/)
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.config import settings
+from app.services.cv_extractor_v3 import get_extractor, ocr_images
+from app.services.extraction_budget import TRUNCATED_PIXELS, cap_lines
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def joined_length(lines) -> int:
+    return len('\n'.join(lines))
+
+
+def test_cap_lines():
+    print_section("cap_lines: plafond de caractères")
+
+    # (lignes, plafond, résultat attendu)
+    cases = [
+        (['a' * 10, 'b' * 10, 'c' * 10], 10, ['a' * 10]),
+        (['a' * 5, 'b' * 4, 'c' * 30], 10, ['a' * 5, 'b' * 4]),
+        (['a' * 5, 'b' * 30], 10, ['a' * 5, 'bbbb']),
+        (['a' * 30], 10, ['a' * 10]),
+        (['a' * 9, 'b'], 10, ['a' * 9]),
+        (['a' * 4, 'b' * 5], 10, None),
+    ]
+    for lines, max_chars, expected in cases:
+        capped = cap_lines(lines, max_chars)
+        assert capped == expected, f"cap_lines({[len(l) for l in lines]}, {max_chars}) = {capped}"
+    print(f"✓ {len(cases)} cas limites")
+
+    # Toutes les combinaisons de petites lignes: jamais au-delà du plafond
+    for max_chars in range(0, 16):
+        for first in range(0, 12):
+            for second in range(0, 12):
+                lines = ['a' * first, 'b' * second, 'c' * 7]
+                capped = cap_lines(lines, max_chars)
+                result = lines if capped is None else capped
+                assert joined_length(result) <= max_chars, \
+                    f"{joined_length(result)} caractères pour un plafond de {max_chars} ({first}, {second})"
+    print("✓ Texte joint toujours sous le plafond")
+
+
+def test_oversized_photo_rejected_from_header():
+    print_section("Photo trop grande: refusée avant décodage")
+
+    width, height = 8000, 6000
+    assert width * height > settings.EXTRACTION_MAX_PIXELS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "photo.png"
+        Image.new('L', (width, height), 255).save(path)
+
+        start = time.perf_counter()
+        result = get_extractor().extract_from_file(str(path))
+        elapsed = time.perf_counter() - start
+
+    assert TRUNCATED_PIXELS in result["truncated_reasons"], result["truncated_reasons"]
+    assert "image_prepare" not in result.get("timings", {}), "Image décodée avant le contrôle du budget"
+    print(f"✓ {width}x{height} refusée en {elapsed * 1000:.0f} ms (troncature: pixels)")
+
+
+def test_ocr_pages_share_deadline():
+    print_section("OCR multi-pages: échéance commune")
+
+    pages = [Image.new('L', (200, 200), 255) for _ in range(4)]
+    start = time.perf_counter()
+    lines = ocr_images(pages, deadline=time.monotonic() - 1)
+    elapsed = time.perf_counter() - start
+
+    assert lines == [[], [], [], []], f"Pages traitées après l'échéance: {lines}"
+    print(f"✓ 4 pages ignorées après l'échéance ({elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    try:
+        test_cap_lines()
+        test_oversized_photo_rejected_from_header()
+        test_ocr_pages_share_deadline()
+        print("\n✓ Tous les tests du budget sont passés")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,83 @@
+"""
+Script de vérification du coût d'import des modules d'extraction
+Chaque module est importé dans un interpréteur neuf, après les frameworks
+(FastAPI, SQLAlchemy, pydantic-settings) dont l'import ne dépend pas de nous:
+seul le coût propre du module est comparé au budget. Il ne doit pas non plus
+charger les dépendances lourdes (chargées par warmup())
+
+Usage: python test_import_time.py   (depuis backend/)
+"""
+import subprocess
+import sys
+
+# Budget par module (secondes), frameworks déjà importés
+IMPORT_BUDGET_SECONDS = 0.5
+
+# Importés avant la mesure: leur coût varie avec la machine, pas avec le code
+BASELINE_MODULES = ["fastapi", "sqlalchemy.orm", "pydantic_settings"]
+
+# Meilleure de N mesures (un import isolé est bruité: disque, CPU partagé)
+RUNS = 3
+
+MODULES = [
+    "app.services.cv_extractor_v3",
+    "app.services.extraction_pool",
+    "app.api.cvs",
+]
+
+HEAVY_MODULES = ["pdfplumber", "PIL", "pytesseract", "rapidfuzz", "dateutil", "numpy"]
+
+PROBE = """
+import sys, time
+import {baseline}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, *loaded)
+"""
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def measure_import(module):
+    """Retourne (meilleure durée en secondes, dépendances lourdes chargées)"""
+    probe = PROBE.format(baseline=", ".join(BASELINE_MODULES), module=module, heavy=HEAVY_MODULES)
+    timings = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()
+        # Dernière ligne: durée puis modules lourds chargés (les prints du module avant)
+        elapsed, *loaded = output[-1].split()
+        timings.append(float(elapsed))
+    return min(timings), loaded
+
+
+def test_import_budget():
+    print_section("Budget d'import des modules d'extraction")
+    failures = []
+
+    for module in MODULES:
+        elapsed, loaded = measure_import(module)
+        ok = elapsed <= IMPORT_BUDGET_SECONDS and not loaded
+        print(f"{'✓' if ok else '❌'} {module}: {elapsed:.3f}s"
+              + (f" (chargé: {', '.join(loaded)})" if loaded else ""))
+        if not ok:
+            failures.append(module)
+
+    assert not failures, f"Modules hors budget: {', '.join(failures)}"
+
+
+if __name__ == "__main__":
+    try:
+        test_import_budget()
+        print("\n✓ Tous les modules respectent le budget")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,295 @@
+"""
+Script de vérification du crawler Rekrute contre un serveur HTTP local
+Le serveur (http.server) sert les pages enregistrées de test_fixtures/rekrute:
+pages de liste ?p=1..3 (10, 10 et 5 offres), puis une page vide, et la
+même page de détail pour chaque offre.
+
+Vérifie la pagination jusqu'à SCRAPING_MAX_OFFERS (sans page de liste en
+trop quelle que soit la concurrence), les nouvelles tentatives
+(503 puis succès, Retry-After borné), une page en échec qui n'arrête pas le
+crawl, et un temps de crawl qui baisse avec la concurrence.
+
+Avec PostgreSQL joignable (DATABASE_URL), save_to_db est rejoué trois fois
+sur les offres crawlées pour vérifier les compteurs inserted / updated /
+unchanged de l'upsert (lignes de test supprimées ensuite).
+
+Usage: python test_scraper.py   (depuis backend/)
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.offer import ScrapedOffer
+from app.scrapers.rekrute_scraper import RekruteScraper
+
+FIXTURES_DIR = Path(__file__).parent / "test_fixtures" / "rekrute"
+LISTING_PAGES = {1: "offres_p1.html", 2: "offres_p2.html", 3: "offres_p3.html"}
+FIXTURE_OFFERS = 25
+
+# Réglages du crawler pendant les tests (restaurés ensuite)
+TEST_SETTINGS = {
+    "SCRAPING_CONCURRENCY": 4,
+    "SCRAPING_RATE": 0.0,
+    "SCRAPING_RETRIES": 2,
+    "SCRAPING_TIMEOUT": 5.0,
+    "SCRAPING_MAX_RETRY_DELAY": 0.2,
+    "SCRAPING_MAX_PAGES": 20,
+    "SCRAPING_MAX_OFFERS": 100,
+    "SCRAPING_FETCH_DETAILS": True,
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Sert les fixtures; comportement réglé par FixtureServer"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.delay)
+        url = urlsplit(self.path)
+
+        with server.lock:
+            server.hits.append(self.path)
+            failures = server.failures.get(self.path, 0)
+            if failures:
+                server.failures[self.path] = failures - 1
+        if failures:
+            self.send_response(503)
+            self.send_header("Retry-After", "3600")
+            self.end_headers()
+            return
+
+        if url.path == "/offres.html":
+            page = int(parse_qs(url.query).get("p", ["1"])[0])
+            fixture = LISTING_PAGES.get(page, "offres_vide.html")
+        elif url.path.startswith("/offre-emploi-"):
+            fixture = "offre_detail.html"
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = (FIXTURES_DIR / fixture).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # File d'attente du listen(): au-delà, les SYN sont perdus et réémis après 1s
+    request_queue_size = 64
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, delay: float = 0.0, failures=None):
+        """delay: latence par réponse (s); failures: chemin -> nombre de 503 à renvoyer"""
+        self.delay = delay
+        self.failures = dict(failures or {})
+        self.hits = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+@contextmanager
+def override_settings(**values):
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def crawl(server: FixtureServer, **overrides):
+    """Crawl du serveur local; retourne (offres, durée en secondes)"""
+    scraper = RekruteScraper()
+    scraper.base_url = server.base_url
+    scraper.offers_url = f"{server.base_url}/offres.html"
+    with override_settings(**{**TEST_SETTINGS, **overrides}):
+        start = time.perf_counter()
+        offers = scraper.scrape()
+    return offers, time.perf_counter() - start
+
+
+def fixture_titles(count: int):
+    """Titres des `count` premières offres des fixtures, dans l'ordre des pages"""
+    scraper = RekruteScraper()
+    titles = []
+    for page in sorted(LISTING_PAGES):
+        html = (FIXTURES_DIR / LISTING_PAGES[page]).read_text(encoding="utf-8")
+        titles.extend(offer["titre"] for offer in scraper.parse_listing(html))
+    return titles[:count]
+
+
+def test_pagination(server: FixtureServer):
+    print_section("Pagination jusqu'à SCRAPING_MAX_OFFERS")
+
+    server.reset()
+    offers, _ = crawl(server, SCRAPING_MAX_OFFERS=15)
+    assert [offer["titre"] for offer in offers] == fixture_titles(15), "Ordre ou nombre d'offres incorrect"
+    print(f"✓ Limite respectée: {len(offers)} offres (pages 1-2)")
+
+    # Vagues limitées aux pages encore nécessaires, même avec 8 requêtes simultanées
+    for max_offers, pages in ((15, 2), (25, 3)):
+        server.reset()
+        offers, _ = crawl(server, SCRAPING_MAX_OFFERS=max_offers, SCRAPING_CONCURRENCY=8)
+        listings = [path for path in server.hits if path.startswith("/offres.html")]
+        assert len(offers) == max_offers, f"{len(offers)} offres au lieu de {max_offers}"
+        assert len(listings) == pages, f"{max_offers} offres: {len(listings)} pages de liste ({listings})"
+        print(f"✓ {max_offers} offres, concurrence 8: {len(listings)} pages de liste demandées")
+
+    server.reset()
+    offers, _ = crawl(server)
+    assert len(offers) == FIXTURE_OFFERS, f"{len(offers)} offres au lieu de {FIXTURE_OFFERS}"
+    assert len({offer["url_source"] for offer in offers}) == FIXTURE_OFFERS, "Offres en double"
+    print(f"✓ Toutes les pages parcourues: {len(offers)} offres, arrêt à la page vide")
+
+    assert all(offer["description"].startswith("Poste Au sein de l'équipe") for offer in offers), \
+        "Description de la page de détail manquante"
+    details = [path for path in server.hits if path.startswith("/offre-emploi-")]
+    assert len(details) == FIXTURE_OFFERS, f"{len(details)} pages de détail récupérées"
+    print(f"✓ Pages de détail: {len(details)} récupérées, descriptions complètes")
+
+
+def test_retries(server: FixtureServer):
+    print_section("Nouvelles tentatives (503 + Retry-After)")
+
+    # Deux 503 avec Retry-After: 3600 (borné à SCRAPING_MAX_RETRY_DELAY)
+    server.reset(failures={"/offres.html?p=2": 2})
+    offers, elapsed = crawl(server)
+    attempts = server.hits.count("/offres.html?p=2")
+    assert len(offers) == FIXTURE_OFFERS, f"{len(offers)} offres après les 503"
+    assert attempts == 3, f"{attempts} tentatives au lieu de 3"
+    assert elapsed < 2.0, f"Retry-After non borné ({elapsed:.2f}s)"
+    print(f"✓ Page 2 récupérée à la tentative {attempts}, crawl en {elapsed:.2f}s")
+
+    # Page en échec après toutes les tentatives: sautée, les suivantes gardées
+    server.reset(failures={"/offres.html?p=2": 10})
+    offers, _ = crawl(server)
+    expected = FIXTURE_OFFERS - 10
+    assert len(offers) == expected, f"{len(offers)} offres au lieu de {expected}"
+    assert offers[-1]["titre"] == fixture_titles(FIXTURE_OFFERS)[-1], "Page 3 perdue"
+    print(f"✓ Page 2 en échec sautée: {len(offers)} offres (pages 1 et 3)")
+
+
+def test_concurrency_scaling(server: FixtureServer):
+    print_section("Temps de crawl selon la concurrence")
+
+    timings = {}
+    for concurrency in (1, 8):
+        server.reset(delay=0.05)
+        offers, timings[concurrency] = crawl(server, SCRAPING_CONCURRENCY=concurrency)
+        assert len(offers) == FIXTURE_OFFERS
+        print(f"   concurrence {concurrency}: {len(server.hits)} requêtes en {timings[concurrency]:.2f}s")
+
+    speedup = timings[1] / timings[8]
+    assert speedup > 3, f"Accélération x{speedup:.1f} seulement avec 8 requêtes simultanées"
+    print(f"✓ Accélération x{speedup:.1f}")
+
+
+def database_available() -> bool:
+    try:
+        with engine.connect():
+            return True
+    except OperationalError:
+        return False
+
+
+def test_upsert_counts(server: FixtureServer):
+    print_section("Upsert: compteurs inserted / updated / unchanged")
+
+    server.reset()
+    offers, _ = crawl(server)
+    # URL uniques à ce run: la base peut déjà contenir des offres
+    prefix = f"{server.base_url}/test-upsert-{uuid.uuid4().hex}/"
+    for number, offer in enumerate(offers):
+        offer["url_source"] = f"{prefix}{number}"
+
+    ScrapedOffer.__table__.create(engine, checkfirst=True)
+    db = SessionLocal()
+    scraper = RekruteScraper()
+    try:
+        # Lots de 10: plusieurs INSERT ... ON CONFLICT par appel
+        with override_settings(SCRAPING_UPSERT_BATCH_SIZE=10):
+            # Une offre en double dans le même appel n'est écrite qu'une fois
+            counts = scraper.save_to_db(offers + [dict(offers[0])], db)
+            assert counts == {"inserted": FIXTURE_OFFERS, "updated": 0, "unchanged": 0}, counts
+            print(f"✓ Premier passage: {counts}")
+
+            counts = scraper.save_to_db(offers, db)
+            assert counts == {"inserted": 0, "updated": 0, "unchanged": FIXTURE_OFFERS}, counts
+            print(f"✓ Offres identiques: {counts}")
+
+            for offer in offers[:3]:
+                offer["titre"] += " (mise à jour)"
+            new_offers = [dict(offers[0], url_source=f"{prefix}new-{number}") for number in range(2)]
+            counts = scraper.save_to_db(offers + new_offers, db)
+            expected = {"inserted": 2, "updated": 3, "unchanged": FIXTURE_OFFERS - 3}
+            assert counts == expected, counts
+            print(f"✓ 3 offres modifiées, 2 nouvelles: {counts}")
+
+        titles = {
+            url: titre for url, titre in db.query(ScrapedOffer.url_source, ScrapedOffer.titre)
+            .filter(ScrapedOffer.url_source.startswith(prefix))
+        }
+        assert len(titles) == FIXTURE_OFFERS + 2, f"{len(titles)} lignes en base"
+        assert titles[f"{prefix}0"].endswith("(mise à jour)"), "Modification non écrite"
+        print(f"✓ {len(titles)} lignes en base, modifications écrites")
+    finally:
+        db.rollback()
+        db.query(ScrapedOffer).filter(ScrapedOffer.url_source.startswith(prefix)) \
+            .delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    server = FixtureServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        test_pagination(server)
+        test_retries(server)
+        test_concurrency_scaling(server)
+        if database_available():
+            test_upsert_counts(server)
+            print("\n✓ Tous les tests du crawler sont passés")
+        else:
+            print("\n⚠️  PostgreSQL injoignable (DATABASE_URL): compteurs de l'upsert non vérifiés")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    finally:
+        server.shutdown()
@@ -0,0 +1,70 @@
+"""
+Script de vérification du classement des titres de sections
+Les titres courts (FR/EN, accents, majuscules) sont reconnus; les phrases du
+corps du CV qui contiennent un mot-clé ("about", "career", "skills", ...)
+ne deviennent pas des titres.
+
+Usage: python test_section_classifier.py   (depuis backend/)
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+from app.services.cv_extractor_v3 import get_extractor
+from app.services.section_classifier import SectionClassifier
+
+HEADINGS = {
+    "EXPÉRIENCES PROFESSIONNELLES": "experience",
+    "Career Objective": "experience",
+    "Formation": "formation",
+    "Academic Background:": "formation",
+    "Compétences techniques": "competences",
+    "Technical Skills": "competences",
+    "Langues": "langues",
+    "About me": "profil",
+}
+
+BODY_LINES = [
+    "I am passionate about building reliable data pipelines for large retail companies",
+    "Looking for a challenging career in software engineering where I can grow",
+    "Used my communication skills daily to coordinate the support team across countries",
+    "Développement de compétences en gestion de projet au sein d'une équipe de dix personnes",
+]
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def test_headings(classifier: SectionClassifier):
+    print_section("Titres reconnus")
+
+    for line, expected in HEADINGS.items():
+        section = classifier.classify(line)
+        assert section == expected, f"{line!r}: {section} au lieu de {expected}"
+    print(f"✓ {len(HEADINGS)} titres classés")
+
+
+def test_body_lines(classifier: SectionClassifier):
+    print_section("Phrases longues avec un mot-clé")
+
+    for line in BODY_LINES:
+        section = classifier.classify(line)
+        assert section is None, f"Phrase classée comme titre ({section}): {line!r}"
+    print(f"✓ {len(BODY_LINES)} phrases laissées dans le corps de la section")
+
+
+if __name__ == "__main__":
+    classifier = get_extractor().section_classifier
+    try:
+        test_headings(classifier)
+        test_body_lines(classifier)
+        print("\n✓ Tous les tests du classement des sections sont passés")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,172 @@
+"""
+Script de vérification du matching de compétences contre l'implémentation
+historique (un re.search par compétence)
+Échantillon: le premier CV de chaque catégorie de UpdatedResumeDataSet.csv,
+plus quelques textes courts sur les frontières de mots (C++, .Net, ...).
+
+- l'automate Aho-Corasick (construit ou mappé depuis l'index .skidx) trouve
+  exactement les compétences des regex \\b...\\b
+- search_skills donne le résultat historique (regex puis extractOne par
+  compétence) avec les moteurs fuzzy extract et cdist ('ngram' compare aussi
+  des fenêtres de plusieurs mots: résultats volontairement différents)
+- search_skills_batch rend les mêmes résultats, dans l'ordre d'entrée, en
+  séquentiel, avec un pool de threads et avec un pool de processus
+
+Usage: python test_skills_matching.py   (depuis backend/)
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import csv
+import re
+from pathlib import Path
+
+from rapidfuzz import fuzz, process
+
+from app.services.skills_loader import SkillsLoader
+
+DATASET_CSV = Path(__file__).parent / "data" / "UpdatedResumeDataSet.csv"
+
+# Moteurs fuzzy censés reproduire exactement le résultat historique
+EQUIVALENT_BACKENDS = ("extract", "cdist")
+
+# Frontières \b autour des symboles, ponctuation collée, majuscules
+BOUNDARY_TEXTS = [
+    "Développeur C++, C# et .Net (ASP.NET Core), Node.js; SQL/NoSQL.",
+    "Compétences: python3, Python_3, PYTHON, java-script, JavaScript, React.js",
+    "Gestion de projet - travail en équipe - communication - leadership",
+    "",
+]
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def load_sample_resumes():
+    """Premier CV de chaque catégorie, puis les textes de frontières"""
+    csv.field_size_limit(2**31 - 1)
+    by_category = {}
+    with open(DATASET_CSV, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if row['Resume'].strip():
+                by_category.setdefault(row['Category'], row['Resume'])
+    return list(by_category.values()) + BOUNDARY_TEXTS
+
+
+def compile_baseline(loader: SkillsLoader):
+    """Regex historiques (compilées une fois: ~2800 motifs dépassent le cache de re)"""
+    return [
+        (category, skill, re.compile(r'\b' + re.escape(skill.lower()) + r'\b'))
+        for category, skills in (('technical', loader.technical_skills), ('soft', loader.soft_skills))
+        for skill in skills
+    ]
+
+
+def baseline_exact(patterns, text: str):
+    """Recherche exacte historique: une regex par compétence"""
+    text_lower = text.lower()
+    found = {'technical': set(), 'soft': set()}
+    for category, skill, pattern in patterns:
+        if pattern.search(text_lower):
+            found[category].add(skill)
+    return found
+
+
+def baseline_search(patterns, text: str, threshold: int = 85):
+    """search_skills historique: regex, puis extractOne pour chaque compétence non trouvée"""
+    found = baseline_exact(patterns, text)
+    words = text.split()
+    for category, skill, _ in patterns:
+        if skill in found[category]:
+            continue
+        match = process.extractOne(skill, words, scorer=fuzz.ratio)
+        if match and match[1] >= threshold:
+            found[category].add(skill)
+    return {category: sorted(skills) for category, skills in found.items()}
+
+
+def assert_same_skills(label: str, got, expected):
+    for category in ('technical', 'soft'):
+        extra = sorted(set(got[category]) - set(expected[category]))
+        missing = sorted(set(expected[category]) - set(got[category]))
+        assert not extra and not missing, (
+            f"{label}, {category}: en trop {extra[:5]}, manquantes {missing[:5]}"
+        )
+
+
+def test_exact_matching(loaders, texts):
+    print_section("Recherche exacte: automate vs regex")
+
+    for name, loader in loaders.items():
+        patterns = compile_baseline(loader)
+        for number, text in enumerate(texts, 1):
+            expected = baseline_exact(patterns, text)
+            found = loader.automaton.search(text.lower())
+            for category in ('technical', 'soft'):
+                got = set(found.get(category, ()))
+                assert got == expected[category], (
+                    f"[{name}] texte {number}, {category}: "
+                    f"en trop {sorted(got - expected[category])[:5]}, "
+                    f"manquantes {sorted(expected[category] - got)[:5]}"
+                )
+        print(f"✓ {name}: {len(texts)} textes identiques aux regex")
+
+
+def test_fuzzy_backends(loader, texts, expected):
+    print_section("search_skills: moteurs fuzzy vs extractOne")
+
+    for backend in EQUIVALENT_BACKENDS:
+        for number, text in enumerate(texts, 1):
+            got = loader.search_skills(text, fuzzy_backend=backend)
+            assert_same_skills(f"[{backend}] texte {number}", got, expected[number - 1])
+        print(f"✓ {backend}: {len(texts)} textes identiques au résultat historique")
+
+
+def test_batch_search(loader, texts, expected):
+    print_section("search_skills_batch vs résultat historique")
+
+    # Paquets de 4 textes: plusieurs paquets par worker et un dernier incomplet
+    modes = {
+        "séquentiel": dict(workers=1),
+        "2 threads": dict(workers=2),
+        "2 processus": dict(workers=2, use_processes=True),
+    }
+    for backend in EQUIVALENT_BACKENDS:
+        for mode, options in modes.items():
+            # Générateur: le lot ne doit pas dépendre d'une liste indexable
+            results = list(loader.search_skills_batch(
+                (text for text in texts), fuzzy_backend=backend, chunk_size=4, **options
+            ))
+            assert len(results) == len(texts), f"[{backend}, {mode}] {len(results)} résultats"
+            for number, (got, want) in enumerate(zip(results, expected), 1):
+                assert_same_skills(f"[{backend}, {mode}] texte {number}", got, want)
+            print(f"✓ {backend}, {mode}: {len(results)} résultats dans l'ordre d'entrée")
+
+
+if __name__ == "__main__":
+    try:
+        texts = load_sample_resumes()
+        loaders = {
+            "automate construit": SkillsLoader(use_index=False),
+            "automate mappé (.skidx)": SkillsLoader(use_index=True),
+        }
+        assert loaders["automate mappé (.skidx)"].index is not None, \
+            "Index .skidx non chargé (python build_skills_index.py)"
+        test_exact_matching(loaders, texts)
+
+        loader = loaders["automate mappé (.skidx)"]
+        patterns = compile_baseline(loader)
+        expected = [baseline_search(patterns, text) for text in texts]
+        test_fuzzy_backends(loader, texts, expected)
+        test_batch_search(loader, texts, expected)
+        print("\n✓ Tous les tests du matching sont passés")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
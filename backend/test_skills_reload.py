@@ -0,0 +1,124 @@
+"""
+Script de vérification du rechargement à chaud du référentiel de compétences
+Le dataset est copié dans un dossier temporaire (le vrai fichier n'est pas
+modifié) et surveillé toutes les 0,2 s.
+
+- un JSON tronqué ne remplace pas la génération courante: même nombre de
+  compétences, même version, et un seul essai tant que le fichier ne change pas
+- le fichier corrigé est ensuite rechargé normalement
+
+Usage: python test_skills_reload.py   (depuis backend/)
+"""
+import sys
+import io
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from app.config import settings
+from app.services import skills_loader
+
+RELOAD_INTERVAL = 0.2
+
+
+def print_section(title):
+    print("\n" + "="*60)
+    print(f"  {title}")
+    print("="*60)
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def write_dataset(dataset: Path, content: bytes):
+    """Écriture atomique: la surveillance ne lit jamais un fichier à moitié écrit"""
+    tmp_path = dataset.with_suffix('.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, dataset)
+
+
+def test_malformed_dataset_keeps_generation(dataset: Path):
+    print_section("JSON tronqué: génération conservée")
+
+    current = skills_loader.get_skills_loader()
+    stats = current.get_stats()
+    assert stats['dataset_version'] != skills_loader.DEFAULT_DATASET_VERSION, "Dataset non chargé"
+    print(f"   Génération {stats['generation']}: {stats['total_skills']} compétences "
+          f"(dataset {stats['dataset_version']})")
+
+    content = dataset.read_bytes()
+    write_dataset(dataset, content[:len(content) // 2])
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        # Plusieurs intervalles de surveillance sur le même fichier invalide
+        failed = wait_for(lambda: skills_loader._failed_dataset_version is not None)
+        time.sleep(RELOAD_INTERVAL * 5)
+    assert failed, "Rechargement du JSON tronqué jamais tenté"
+
+    loader = skills_loader.get_skills_loader()
+    assert loader is current, f"Génération remplacée: {loader.get_stats()}"
+    assert loader.get_stats() == stats, f"Statistiques modifiées: {loader.get_stats()}"
+    print(f"✓ Génération {stats['generation']} conservée: {stats['total_skills']} compétences")
+
+    attempts = output.getvalue().count("Rechargement du référentiel échoué")
+    assert attempts == 1, f"{attempts} essais sur le même fichier invalide"
+    print("✓ Un seul essai tant que le fichier ne change pas")
+
+    return content, stats
+
+
+def test_fixed_dataset_is_reloaded(dataset: Path, content: bytes, stats):
+    print_section("Dataset corrigé: nouvelle génération")
+
+    data = json.loads(content.decode('utf-8'))
+    data['technical_skills'].append("Compétence de test rechargement")
+    write_dataset(dataset, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    with redirect_stdout(io.StringIO()):
+        reloaded = wait_for(lambda: skills_loader.get_skills_loader().generation > stats['generation'])
+    assert reloaded, "Dataset corrigé non rechargé"
+
+    new_stats = skills_loader.get_skills_loader().get_stats()
+    assert new_stats['total_skills'] == stats['total_skills'] + 1, new_stats
+    assert skills_loader._failed_dataset_version is None
+    print(f"✓ Génération {new_stats['generation']}: {new_stats['total_skills']} compétences")
+
+
+if __name__ == "__main__":
+    source = skills_loader.find_dataset_path()
+    if source is None:
+        print("❌ Aucun dataset de compétences dans backend/data")
+        sys.exit(1)
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="skills-reload-"))
+    dataset = tmp_dir / skills_loader.RESUME_COMPLETE_FR.name
+    shutil.copyfile(source, dataset)
+    skills_loader.RESUME_COMPLETE_FR = dataset
+    skills_loader.RESUME_COMPLETE = tmp_dir / skills_loader.RESUME_COMPLETE.name
+    settings.SKILLS_RELOAD_INTERVAL = RELOAD_INTERVAL
+
+    try:
+        content, stats = test_malformed_dataset_keeps_generation(dataset)
+        test_fixed_dataset_is_reloaded(dataset, content, stats)
+        print("\n✓ Tous les tests du rechargement sont passés")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)